@@ -8,4 +8,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alisa_club.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from apps.events.live import SeatStreamApp  # noqa: E402
+
+# Canlı yer sayı axını (SSE) middleware-siz, qalan hər şey Django-ya
+application = SeatStreamApp(django_application)
@@ -79,9 +79,39 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Eyni anda yazan işçilər "database is locked" əvəzinə növbə gözləsin
+            'timeout': 20,
+        },
     }
 }
 
+# Cache: REDIS_URL verilibsə bütün işçilər arasında paylaşılır, yoxsa proses daxili
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Kateqoriya/paket cache-inin paylaşılan versiyanı yoxlama intervalı (saniyə, apps.core.refdata)
+REFDATA_CHECK_INTERVAL = 2
+# Cache paylaşılmırsa (REDIS_URL yoxdur) cədvəllər ən gec bu qədər saniyədən bir yenidən oxunur
+REFDATA_LOCAL_TTL = 30
+
+# Rezervasiya formu açıq olarkən yerin saxlanma müddəti (saniyə)
+EVENT_SEAT_HOLD_TTL = 10 * 60
+
+# Qapıdakı QR skanerlərinin X-Scanner-Key başlığı (boşdursa yalnız admin sessiyası)
+EVENT_SCANNER_KEY = os.getenv('EVENT_SCANNER_KEY', '')
+
+# Canlı yer sayı (SSE): digər işçilərin dəyişikliklərini yoxlama intervalı, boş bağlantı üçün ping
+EVENT_LIVE_POLL_INTERVAL = 1
+EVENT_LIVE_HEARTBEAT = 20
+EVENT_LIVE_MAX_EVENTS = 50
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -115,6 +145,24 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Qorunan material fayllarının göndərilməsi: 'django' (axın + Range), 'accel' (nginx X-Accel-Redirect), 'sendfile'
+MATERIAL_DELIVERY = os.getenv('MATERIAL_DELIVERY', 'django')
+MATERIAL_ACCEL_PREFIX = '/protected-media/'
+# İmzalı yükləmə linklərinin etibarlılıq pəncərəsi (saniyə)
+MATERIAL_LINK_TTL = 15 * 60
+
+# Günlük statistika: "populyar" sıralamasının pəncərəsi və xam yükləmə qeydlərinin saxlanma müddəti (gün)
+MATERIAL_POPULAR_DAYS = 30
+MATERIAL_DOWNLOAD_RETENTION_DAYS = 90
+# Yükləmə rollup-u əvvəlki işdən bu qədər saniyə geriyə də baxır (gec commit olunan qeydlər üçün)
+MATERIAL_ROLLUP_OVERLAP_SECONDS = 10 * 60
+
+# "Oxşar materiallar": material başına saxlanılan qonşu sayı (build_material_recommendations)
+MATERIAL_RECOMMENDATION_TOP_K = 8
+
+# Uşaq lentinin cache müddəti (saniyə); yaş qrupu dəyişəndə daha tez bitir (membership.feed)
+CHILD_FEED_CACHE_TIMEOUT = 60 * 60
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
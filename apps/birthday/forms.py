@@ -1,4 +1,5 @@
 from django import forms
+from apps.core import refdata
 from .models import BirthdayBooking, BirthdayPackage, BirthdayInquiry
 from apps.membership.models import Child
 from datetime import timezone
@@ -22,7 +23,10 @@ class BirthdayBookingForm(forms.ModelForm):
         if user:
             self.fields['child'].queryset = Child.objects.filter(parent=user)
         
-        self.fields['package'].queryset = BirthdayPackage.objects.filter(is_active=True)
+        # Seçimlər proses daxili cache-dən; queryset yalnız göndərilən dəyəri yoxlayır
+        package = self.fields['package']
+        package.queryset = BirthdayPackage.objects.filter(is_active=True)
+        package.choices = [('', package.empty_label)] + refdata.birthday_packages.choices()
     
     def clean_guest_count(self):
         guest_count = self.cleaned_data.get('guest_count')
@@ -3,13 +3,16 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, F
+from django.http import Http404
+from django.db.models import Q
+from apps.core import refdata
+from apps.core.counters import counter_buffer
 from .models import BlogPost, BlogCategory, BlogComment
 from .forms import BlogCommentForm
 
 def blog_list(request):
     posts = BlogPost.objects.filter(status='published').select_related('category', 'author')
-    categories = BlogCategory.objects.filter(is_active=True)
+    categories = refdata.blog_categories.all()
     
     # Filter by category
     category_slug = request.GET.get('category')
@@ -48,8 +51,9 @@ def blog_list(request):
 def post_detail(request, slug):
     post = get_object_or_404(BlogPost, slug=slug, status='published')
     
-    # Increment view count
-    BlogPost.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
+    # Increment view count (batched write-behind, see apps.core.counters)
+    counter_buffer.add(BlogPost, post.pk, 'views_count')
+    post.views_count += counter_buffer.pending(BlogPost, post.pk, 'views_count')
     
     # Get approved comments
     comments = post.comments.filter(is_approved=True).select_related('author')
@@ -83,8 +87,10 @@ def post_detail(request, slug):
     return render(request, 'blog/post_detail.html', context)
 
 def category_posts(request, slug):
-    category = get_object_or_404(BlogCategory, slug=slug, is_active=True)
-    posts = BlogPost.objects.filter(category=category, status='published').select_related('author')
+    category = refdata.blog_categories.find(slug=slug)
+    if category is None:
+        raise Http404
+    posts = BlogPost.objects.filter(category_id=category.id, status='published').select_related('author')
     
     paginator = Paginator(posts, 9)
     page_number = request.GET.get('page')
@@ -0,0 +1,107 @@
+"""Baxış və yükləmə sayğacları üçün toplu yazma (write-behind).
+
+Hər baxışda UPDATE etmək əvəzinə artımlar proses daxilində toplanır və
+interval saniyədə bir (və ya max_size artımdan sonra) sahə və artım
+miqdarına görə qruplaşdırılmış UPDATE-lərlə yazılır:
+UPDATE ... SET view_count = view_count + 3 WHERE id IN (...).
+Proses dayananda qalanlar da yazılır. Sayğaclar təxminidir - proses
+qəfil ölərsə son interval itə bilər.
+
+track_daily ilə qeydiyyatdan keçmiş (model, sahə) üçün artımlar həm də
+buferə düşdüyü günə görə yığılır və eyni tranzaksiyada günlük statistika
+yazıcısına verilir - baxışlar işin işlədiyi günə deyil, baş verdiyi günə
+yazılır.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """Artımları {(model, sahə): Counter(pk)} şəklində toplayıb toplu yaz"""
+
+    def __init__(self, max_size=1000, interval=5.0):
+        self.max_size = max_size
+        self.interval = interval
+        self._pending = defaultdict(Counter)
+        self._daily = {}
+        self._days = defaultdict(Counter)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def track_daily(self, model, field, writer):
+        """writer({(pk, gün): artım}) sayğacla eyni tranzaksiyada çağırılır"""
+        self._daily[model, field] = writer
+
+    def add(self, model, pk, field, amount=1):
+        with self._lock:
+            self._pending[model, field][pk] += amount
+            if (model, field) in self._daily:
+                self._days[model, field][pk, timezone.localdate()] += amount
+            self._size += 1
+            size = self._size
+            if size < self.max_size and self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if size >= self.max_size:
+            self.flush()
+
+    def pending(self, model, pk, field):
+        """Hələ yazılmamış artım (səhifədə dəqiq rəqəm göstərmək üçün)"""
+        with self._lock:
+            counts = self._pending.get((model, field))
+            return counts[pk] if counts else 0
+
+    def _flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        """Yığılanları yaz; qaytarır: yazılan UPDATE sayı"""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+            days, self._days = self._days, defaultdict(Counter)
+            self._size = 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        statements = 0
+        for (model, field), counts in pending.items():
+            by_amount = defaultdict(list)
+            for pk, amount in counts.items():
+                by_amount[amount].append(pk)
+            day_counts = days.get((model, field))
+            try:
+                with transaction.atomic():
+                    for amount, pks in by_amount.items():
+                        model.objects.filter(pk__in=pks).update(**{field: F(field) + amount})
+                    if day_counts:
+                        self._daily[model, field](day_counts)
+            except DatabaseError:
+                # Baza məşğuldur - növbəti dəfə yenidən cəhd edilir
+                logger.exception('Sayğaclar yazıla bilmədi: %s.%s', model.__name__, field)
+                with self._lock:
+                    self._pending[model, field].update(counts)
+                    if day_counts:
+                        self._days[model, field].update(day_counts)
+                    self._size += len(counts)
+            else:
+                statements += len(by_amount)
+        return statements
+
+
+counter_buffer = CounterBuffer()
+atexit.register(counter_buffer.flush)
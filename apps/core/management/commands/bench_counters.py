@@ -0,0 +1,112 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Sum
+from django.test import Client
+from django.utils import timezone
+
+from apps.blog.models import BlogCategory, BlogPost
+from apps.core.counters import counter_buffer
+from apps.kids_content.models import ContentCategory, KidsMaterial
+
+
+class Command(BaseCommand):
+    help = ('Baxış sayğacları benchmark-ı: material_detail və post_detail səhifələrinin '
+            'hər baxışda UPDATE (direct) və toplu yazma (buffered) rejimlərində ötürmə qabiliyyəti')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=100, help='Hər axın üçün sorğu sayı')
+        parser.add_argument('--objects', type=int, default=5, help='Material və yazı sayı')
+        parser.add_argument('--keep', action='store_true', help='Test məlumatlarını silmə')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.settings_dict['NAME'] in ('', ':memory:'):
+            raise CommandError('Yaddaşdakı SQLite bazası axınlar arasında paylaşılmır.')
+
+        stamp = int(time.time() * 1000)
+        author = User.objects.create(username=f'bench-{stamp}')
+        content_category = ContentCategory.objects.create(name=f'bench-{stamp}', description='bench')
+        blog_category = BlogCategory.objects.create(name=f'bench-{stamp}', slug=f'bench-{stamp}')
+        materials = KidsMaterial.objects.bulk_create([
+            KidsMaterial(
+                title=f'bench-{stamp}-{i}', description='bench', category=content_category,
+                material_type='story', age_group='3-5',
+            )
+            for i in range(options['objects'])
+        ])
+        posts = BlogPost.objects.bulk_create([
+            BlogPost(
+                title=f'bench-{stamp}-{i}', slug=f'bench-{stamp}-{i}', author=author,
+                category=blog_category, excerpt='bench', content='bench',
+                status='published', published_at=timezone.now(),
+            )
+            for i in range(options['objects'])
+        ])
+        self.material_ids = [material.pk for material in materials]
+        self.post_ids = [post.pk for post in posts]
+        urls = [material.get_absolute_url() for material in materials]
+        urls += [post.get_absolute_url() for post in posts]
+
+        try:
+            for mode in ('direct', 'buffered'):
+                self.run(mode, urls, options)
+        finally:
+            if not options['keep']:
+                KidsMaterial.objects.filter(pk__in=self.material_ids).delete()
+                BlogPost.objects.filter(pk__in=self.post_ids).delete()
+                content_category.delete()
+                blog_category.delete()
+                author.delete()
+
+    def run(self, mode, urls, options):
+        threads = options['threads']
+        expected = threads * options['requests']
+        before = self.total_views()
+
+        # direct: hər artım dərhal yazılır - köhnə davranış (bir baxış = bir UPDATE)
+        default_size = counter_buffer.max_size
+        counter_buffer.max_size = 1 if mode == 'direct' else default_size
+        errors = []
+        start_gate = threading.Barrier(threads)
+
+        def worker(offset):
+            client = Client()
+            try:
+                start_gate.wait()
+                for i in range(options['requests']):
+                    response = client.get(urls[(offset + i) % len(urls)])
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+            except Exception as exc:  # noqa: BLE001 - hesabatda göstərilir
+                errors.append(repr(exc))
+            finally:
+                connections.close_all()
+
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        began = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        statements = counter_buffer.flush()
+        counter_buffer.max_size = default_size
+
+        counted = self.total_views() - before
+        self.stdout.write(
+            f'{mode:>8}: {expected} baxış {elapsed:.2f}s-də, {expected / elapsed:.0f} sorğu/s; '
+            f'sonuncu flush {statements} UPDATE, yazılan baxış {counted}'
+        )
+        if errors:
+            raise CommandError(f'{len(errors)} sorğu uğursuz oldu: {errors[0]}')
+        if counted != expected:
+            raise CommandError(f'Baxışlar itdi: gözlənilən {expected}, yazılan {counted}')
+
+    def total_views(self):
+        materials = KidsMaterial.objects.filter(pk__in=self.material_ids).aggregate(total=Sum('view_count'))
+        posts = BlogPost.objects.filter(pk__in=self.post_ids).aggregate(total=Sum('views_count'))
+        return materials['total'] + posts['total']
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.counters import counter_buffer
+from apps.events.models import Event, EventCategory, EventReview
+from apps.kids_content.models import ContentCategory, KidsMaterial, LearningProgress, MaterialRating
+
+
+# Sessiya + istifadəçi (daxil olmuş baxan üçün 2 sorğu) daxil olmaqla
+BUDGETS = {
+    ('material_detail', 'anonim'): 3,
+    ('material_detail', 'daxil olmuş'): 5,
+    ('event_detail', 'anonim'): 2,
+    ('event_detail', 'daxil olmuş'): 5,
+    ('event_detail (dolu)', 'daxil olmuş'): 7,
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('material_detail və event_detail səhifələrinin sorğu sayını anonim və daxil olmuş '
+            'baxan üçün yoxlayır; büdcə aşılırsa və ya oxuma zamanı yazı olursa xəta ilə bitir')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-sql', action='store_true', help='Hər sorğunu göstər')
+
+    def handle(self, *args, **options):
+        self.failures = []
+        try:
+            with transaction.atomic():
+                self.run_checks(options['verbose_sql'])
+                # Sayğac artımları da geri qaytarılan tranzaksiyada yazılsın
+                counter_buffer.flush()
+                raise Rollback
+        except Rollback:
+            pass
+
+        if self.failures:
+            raise CommandError('; '.join(self.failures))
+        self.stdout.write(self.style.SUCCESS('Bütün səhifələr sorğu büdcəsi daxilindədir.'))
+
+    def run_checks(self, verbose_sql):
+        user = User.objects.create_user('query-check')
+        content_category = ContentCategory.objects.create(name='query-check')
+        materials = [
+            KidsMaterial.objects.create(
+                title=f'query-check-{i}', description='-', category=content_category,
+                material_type='story', age_group='3-5',
+            )
+            for i in range(5)
+        ]
+        MaterialRating.objects.create(material=materials[0], user=user, rating=5, comment='-')
+
+        event_category = EventCategory.objects.create(name='query-check')
+        events = {}
+        for label, capacity in (('event_detail', 10), ('event_detail (dolu)', 0)):
+            events[label] = Event.objects.create(
+                title=label, description='-', category=event_category, image='query-check.jpg',
+                date=timezone.now() + timedelta(days=1), duration=60, location='-',
+                age_group='all', max_participants=capacity, price=0,
+            )
+            EventReview.objects.create(event=events[label], user=user, rating=4, comment='-')
+
+        pages = [('material_detail', reverse('kids_content:material_detail', args=[materials[0].pk]))]
+        pages += [(label, reverse('events:event_detail', args=[event.pk])) for label, event in events.items()]
+
+        anonymous = Client()
+        logged_in = Client()
+        logged_in.force_login(user)
+        for viewer, client in (('anonim', anonymous), ('daxil olmuş', logged_in)):
+            for label, url in pages:
+                budget = BUDGETS.get((label, viewer))
+                if budget is None:
+                    continue
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                count = len(queries)
+                writes = [q['sql'] for q in queries if not q['sql'].lstrip().upper().startswith('SELECT')]
+
+                status = 'OK' if count <= budget and not writes else 'XƏTA'
+                self.stdout.write(f'{status:5} {label} [{viewer}]: {count}/{budget} sorğu')
+                if verbose_sql:
+                    for query in queries:
+                        self.stdout.write(f'      {query["sql"][:160]}')
+                if response.status_code != 200:
+                    self.failures.append(f'{label} [{viewer}]: status {response.status_code}')
+                if count > budget:
+                    self.failures.append(f'{label} [{viewer}]: {count} sorğu (büdcə {budget})')
+                if writes:
+                    self.failures.append(f'{label} [{viewer}]: oxuma zamanı yazı: {writes[0][:80]}')
+
+        if LearningProgress.objects.filter(user=user).exists():
+            self.failures.append('material_detail oxuma zamanı LearningProgress yaratdı')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+from apps.events.models import EventReview, EventRatingSummary
+from apps.kids_content.models import KidsMaterial, MaterialRating, MaterialRatingSummary
+
+
+class Command(BaseCommand):
+    help = 'Tədbir və material reytinq xülasələrini rəylərdən yenidən qurur'
+    
+    def handle(self, *args, **options):
+        events = EventRatingSummary.rebuild(EventReview.objects.all())
+        
+        with transaction.atomic():
+            materials = MaterialRatingSummary.rebuild(MaterialRating.objects.all())
+            average = MaterialRatingSummary.objects.filter(material=OuterRef('pk')).annotate(
+                average=Cast(F('total'), FloatField()) / F('count')
+            ).values('average')
+            KidsMaterial.objects.update(rating_average=Coalesce(Subquery(average), Value(0.0)))
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(events)} tədbir və {len(materials)} material xülasəsi yeniləndi.'
+        ))
@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from . import ratings as rating_summaries
+
 class Subscription(models.Model):
     email = models.EmailField(unique=True, verbose_name='E-poçt Ünvanı')
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, verbose_name='İstifadəçi')
@@ -29,4 +32,72 @@ class ContactMessage(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.name} - {self.created_at.strftime('%d.%m.%Y %H:%M')}"
\ No newline at end of file
+        return f"{self.name} - {self.created_at.strftime('%d.%m.%Y %H:%M')}"
+
+
+class RatingSummary(models.Model):
+    """Qiymətləndirmə xülasəsi: say, cəm və 1-5 histoqram.
+    
+    Hər rəy yazılanda/silinəndə F() ifadələri ilə artımlı yenilənir, buna görə
+    detal səhifələri Avg(...) aqreqatı əvəzinə bir sətir oxuyur. Alt siniflər
+    target_field adlı OneToOneField təyin edir.
+    """
+    target_field = None
+    STARS = rating_summaries.STARS
+    
+    count = models.PositiveIntegerField(default=0, verbose_name='Rəy sayı')
+    total = models.PositiveIntegerField(default=0, verbose_name='Qiymətlərin cəmi')
+    star_1 = models.PositiveIntegerField(default=0)
+    star_2 = models.PositiveIntegerField(default=0)
+    star_3 = models.PositiveIntegerField(default=0)
+    star_4 = models.PositiveIntegerField(default=0)
+    star_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+    
+    @property
+    def histogram(self):
+        """[(ulduz, say, faiz), ...] 5-dən 1-ə"""
+        return [
+            (star, getattr(self, f'star_{star}'), round(100 * getattr(self, f'star_{star}') / self.count) if self.count else 0)
+            for star in reversed(self.STARS)
+        ]
+    
+    @classmethod
+    def apply(cls, target_id, rating, delta):
+        """Bir qiyməti xülasəyə əlavə et (delta=1) və ya çıx (delta=-1)"""
+        lookup = {f'{cls.target_field}_id': target_id}
+        changes = {'count': delta, 'total': delta * rating, f'star_{rating}': delta}
+        with transaction.atomic():
+            updated = cls.objects.filter(**lookup).update(
+                updated_at=timezone.now(),
+                **{field: F(field) + value for field, value in changes.items()}
+            )
+            if not updated and delta > 0:
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(**lookup, **changes)
+                except IntegrityError:
+                    # Paralel yaradılıb - artımı mövcud sətrə tətbiq et
+                    cls.objects.filter(**lookup).update(
+                        **{field: F(field) + value for field, value in changes.items()}
+                    )
+            cls.summary_changed(target_id)
+    
+    @classmethod
+    def summary_changed(cls, target_id):
+        """Xülasə dəyişəndən sonra (eyni tranzaksiyada) çağırılır"""
+    
+    @classmethod
+    def rebuild(cls, ratings):
+        """Xülasələri sıfırdan qur; ratings - `rating` sahəsi olan rəylərin queryset-i"""
+        with transaction.atomic():
+            cls.objects.all().delete()
+            summaries = rating_summaries.build_summaries(cls, ratings, cls.target_field)
+        return summaries
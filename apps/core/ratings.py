@@ -0,0 +1,51 @@
+"""Qiymətləndirmə xülasələri (RatingSummary) üçün ortaq köməkçilər.
+
+build_summaries xülasələri sıfırdan qurur (RatingSummary.rebuild);
+track_ratings isə rəy modelinin siqnallarını xülasəyə bağlayır - hər
+yazılış/silinmə artımlı RatingSummary.apply çağırışıdır.
+"""
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+
+
+STARS = range(1, 6)
+
+
+def build_summaries(summary_model, ratings, target_field):
+    """ratings-i hədəf üzrə bir GROUP BY ilə say və xülasələri bulk_create ilə yarat"""
+    rows = (
+        ratings.order_by()
+        .values(f'{target_field}_id')
+        .annotate(
+            count=Count('pk'),
+            total=Sum('rating'),
+            **{f'star_{star}': Count('pk', filter=Q(rating=star)) for star in STARS}
+        )
+    )
+    return summary_model.objects.bulk_create([summary_model(**row) for row in rows], batch_size=500)
+
+
+def track_ratings(rating_model, summary_model):
+    """rating_model-in yazılış/silinmələrini summary_model-ə tətbiq et (apps.ready-dən bir dəfə)"""
+    target = f'{summary_model.target_field}_id'
+    uid = f'ratings:{rating_model._meta.label}'
+
+    def remember_previous_rating(sender, instance, **kwargs):
+        instance._previous_rating = None
+        if instance.pk:
+            instance._previous_rating = sender.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+
+    def update_rating_summary(sender, instance, created, **kwargs):
+        previous = getattr(instance, '_previous_rating', None)
+        changed = previous is not None and previous != instance.rating
+        if changed:
+            summary_model.apply(getattr(instance, target), previous, -1)
+        if created or changed:
+            summary_model.apply(getattr(instance, target), instance.rating, 1)
+
+    def remove_from_rating_summary(sender, instance, **kwargs):
+        summary_model.apply(getattr(instance, target), instance.rating, -1)
+
+    pre_save.connect(remember_previous_rating, sender=rating_model, weak=False, dispatch_uid=f'{uid}:pre_save')
+    post_save.connect(update_rating_summary, sender=rating_model, weak=False, dispatch_uid=f'{uid}:post_save')
+    post_delete.connect(remove_from_rating_summary, sender=rating_model, weak=False, dispatch_uid=f'{uid}:post_delete')
@@ -0,0 +1,128 @@
+"""Kiçik, nadir dəyişən cədvəllər üçün proses daxili cache (kateqoriyalar, paketlər).
+
+Hər cədvəl bir dəfə oxunur və __slots__-lu yığcam qeydlər kimi prosesin
+yaddaşında saxlanılır. Etibarlılıq paylaşılan cache-dəki versiya möhürü ilə
+yoxlanılır: model saxlananda və ya silinəndə (tranzaksiya commit olduqdan
+sonra) möhür yenilənir, digər worker-lər bunu ən gec REFDATA_CHECK_INTERVAL
+saniyə ərzində görüb cədvəli yenidən oxuyur. Siyahı səhifələri bu
+cədvəllər üçün DB-yə getmir.
+
+Cache paylaşılmırsa (LocMem) möhür digər işçilərə çatmır; onda cədvəl
+versiyadan asılı olmayaraq ən gec REFDATA_LOCAL_TTL saniyədən bir yenidən
+oxunur.
+"""
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import stamps
+
+
+def check_interval():
+    return getattr(settings, 'REFDATA_CHECK_INTERVAL', 2.0)
+
+
+def local_ttl():
+    return getattr(settings, 'REFDATA_LOCAL_TTL', 30.0)
+
+
+class Record:
+    """Qeydlərin ortaq bazası; sahələr alt sinifdə __slots__ ilə verilir"""
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.id}: {self.name}>'
+
+
+class Table:
+    """Bir modelin (filtrlənmiş) sətirləri - yaddaşda, versiya möhürü ilə"""
+
+    def __init__(self, model, fields, filters=None, order_by=None):
+        self.model_label = model
+        self.fields = tuple(fields)
+        self.filters = filters or {}
+        self.order_by = order_by
+        self.record_class = type(f'{model.rsplit(".", 1)[1]}Record', (Record,), {'__slots__': self.fields})
+        self.version_key = f'refdata:version:{model.lower()}'
+
+        self._lock = threading.Lock()
+        self._version = None
+        self._records = ()
+        self._by_id = {}
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+        for signal in (post_save, post_delete):
+            signal.connect(self._changed, sender=model, weak=False, dispatch_uid=f'refdata:{model}')
+
+    def _load(self):
+        queryset = apps.get_model(self.model_label).objects.filter(**self.filters)
+        if self.order_by:
+            queryset = queryset.order_by(*self.order_by)
+        return tuple(self.record_class(**row) for row in queryset.values(*self.fields))
+
+    def all(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < check_interval():
+            return self._records
+        with self._lock:
+            version = stamps.get(self.version_key)
+            expired = not stamps.is_shared() and now - self._loaded_at >= local_ttl()
+            if version != self._version or expired:
+                records = self._load()
+                self._records, self._by_id = records, {record.id: record for record in records}
+                self._version = version
+                self._loaded_at = now
+            self._checked_at = now
+            return self._records
+
+    def get(self, pk):
+        """Qeyd və ya None (pk sətir də ola bilər - GET parametrləri)"""
+        self.all()
+        try:
+            return self._by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def find(self, **lookup):
+        return next(
+            (record for record in self.all() if all(getattr(record, k) == v for k, v in lookup.items())),
+            None,
+        )
+
+    def choices(self):
+        return [(record.id, str(record)) for record in self.all()]
+
+    def invalidate(self):
+        stamps.bump(self.version_key)
+        self._version = None
+
+    def _changed(self, sender, **kwargs):
+        transaction.on_commit(self.invalidate)
+
+
+content_categories = Table('kids_content.ContentCategory', ('id', 'name', 'description', 'color', 'icon'))
+event_categories = Table('events.EventCategory', ('id', 'name', 'description', 'color', 'icon'))
+medal_categories = Table('medals.MedalCategory', ('id', 'name', 'description', 'color', 'icon'))
+blog_categories = Table(
+    'blog.BlogCategory', ('id', 'name', 'slug', 'description', 'color', 'icon'), filters={'is_active': True},
+)
+birthday_packages = Table(
+    'birthday.BirthdayPackage', ('id', 'name', 'package_type', 'price', 'duration_hours', 'max_guests'),
+    filters={'is_active': True},
+)
@@ -0,0 +1,41 @@
+"""Cache açarlarının versiya möhürləri (facets, refdata, uşaq lenti).
+
+Asılı açarlar möhürün cari dəyərini öz adına qatır; məlumat dəyişəndə
+bump() möhürü yeniləyir və köhnə açarlar öz-özünə istifadəsiz qalır.
+Möhür artan sayğac yox, vaxtdır (time_ns): açar cache-dən düşüb yenidən
+yaradılsa belə əvvəlki dəyərlərdən biri təkrarlanmır və köhnə nəticə geri
+qayıtmır.
+
+Möhürlər yalnız cache bütün işçi proseslərinin ortaq cache-idirsə
+(Redis və s.) işçilər arasında işləyir - is_shared() bunu yoxlayır.
+"""
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared():
+    """Standart cache digər proseslərlə paylaşılırmı (LocMem/Dummy - yox)"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def get(key):
+    """Möhürün cari dəyəri; yoxdursa yaradılır"""
+    return cache.get_or_set(key, time.time_ns, None)
+
+
+def get_many(keys):
+    """{açar: möhür} - bir cache sorğusu, yoxdursa yaradılır"""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = bump(key)
+    return versions
+
+
+def bump(key):
+    version = time.time_ns()
+    cache.set(key, version, None)
+    return version
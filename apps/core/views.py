@@ -5,11 +5,10 @@ from django.conf import settings
 from apps.events.models import Event
 from apps.blog.models import BlogPost  # Assuming you have a BlogPost model for latest_posts
 from .forms import ContactForm, SubscriptionForm
-from django.utils import timezone
 
 def home(request):
     """Ana səhifə"""
-    events = Event.objects.filter(status='upcoming', date__gte=timezone.now())[:3]
+    events = Event.objects.with_capacity().upcoming()[:3]
     latest_posts = BlogPost.objects.order_by('-created_at')[:3]
     context = {
         'subscribe_form': SubscriptionForm(),
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import EventCategory, Event, Booking, EventReview
+from .models import EventCategory, Event, EventSeries, Booking, EventReview, WaitlistEntry
+from . import services
 
 
 @admin.register(EventCategory)
@@ -11,9 +12,23 @@ class EventCategoryAdmin(admin.ModelAdmin):
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'date', 'max_participants', 'booking_count', 'available_spots', 'status']
-    list_filter = ['category', 'status', 'age_group', 'date']
+    list_filter = ['category', 'status', 'age_group', 'date', 'queue_mode', 'series']
     search_fields = ['title', 'description']
     readonly_fields = ['created_at', 'updated_at']
+    actions = ['cancel_events']
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'status' in form.changed_data and obj.status == 'cancelled':
+            cancelled = services.cancel_event(obj)
+            self.message_user(request, f'{cancelled} rezervasiya ləğv edildi, valideynlərə bildiriş göndərilir.')
+    
+    @admin.action(description='Seçilmiş tədbirləri ləğv et')
+    def cancel_events(self, request, queryset):
+        total = 0
+        for event in queryset.exclude(status='cancelled').only('pk', 'title', 'date'):
+            total += services.cancel_event(event)
+        self.message_user(request, f'{total} rezervasiya ləğv edildi, valideynlərə bildiriş göndərilir.')
     
     def booking_count(self, obj):
         return obj.booking_count
@@ -24,12 +39,52 @@ class EventAdmin(admin.ModelAdmin):
     available_spots.short_description = 'Boş yerlər'
 
 
+@admin.register(EventSeries)
+class EventSeriesAdmin(admin.ModelAdmin):
+    list_display = ['title', 'category', 'weekdays', 'start_time', 'starts_on', 'ends_on', 'generated_until', 'is_active']
+    list_filter = ['category', 'is_active', 'age_group']
+    search_fields = ['title', 'description']
+    readonly_fields = ['generated_until', 'created_at', 'updated_at']
+    
+    SCHEDULE_FIELDS = {'weekdays', 'interval_weeks', 'start_time', 'starts_on', 'ends_on'}
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change:
+            updated = obj.sync_future_events(schedule_changed=bool(self.SCHEDULE_FIELDS & set(form.changed_data)))
+            self.message_user(request, f'{updated} gələcək tədbir yeniləndi.')
+        created = obj.materialize()
+        if created:
+            self.message_user(request, f'{len(created)} yeni tədbir yaradıldı.')
+
+
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     list_display = ['event', 'child', 'user', 'status', 'booking_date', 'attended']
     list_filter = ['status', 'attended', 'booking_date']
     search_fields = ['event__title', 'child__name', 'user__username']
     readonly_fields = ['booking_date']
+    actions = ['cancel_selected', 'mark_attended']
+    
+    @admin.action(description='Seçilmiş rezervasiyaları ləğv et')
+    def cancel_selected(self, request, queryset):
+        cancelled = services.cancel_bookings(queryset)
+        self.message_user(request, f'{cancelled} rezervasiya ləğv edildi, boşalan yerlər gözləmə siyahısına verildi.')
+    
+    @admin.action(description='Seçilmişləri iştirak etdi kimi işarələ')
+    def mark_attended(self, request, queryset):
+        updated = queryset.filter(
+            status__in=services.CHECK_IN_STATUSES, attended=False
+        ).update(attended=True)
+        self.message_user(request, f'{updated} rezervasiya iştirak etdi kimi işarələndi.')
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ['event', 'child', 'user', 'status', 'created_at', 'promoted_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['event__title', 'child__name', 'user__username']
+    readonly_fields = ['created_at', 'promoted_at']
 
 
 @admin.register(EventReview)
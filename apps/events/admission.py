@@ -0,0 +1,103 @@
+"""Tez satılan tədbirlər üçün virtual növbə (queue mode).
+
+book_event-ə gələn hər istifadəçi imzalı bilet alır; biletdə sıra nömrəsi
+və öz buraxılma vaxtı (slot) var. Slotlar tədbirin queue_rate sürəti ilə
+bir-birindən 60/rate saniyə aralı verilir: slot = max(indi, əvvəlki slot +
+60/rate). Növbə boş qalanda kredit yığılmır - bir saat sonra gələn yüz nəfər
+də eyni sürətlə, bir-bir buraxılır. Biletin buraxılıb-buraxılmadığı yalnız
+imzadan və vaxtdan hesablanır - gözləmə səhifəsinin sorğuları bazaya
+toxunmur.
+
+Son slot və sıra sayğacı cache-dədir və qısa cache kilidi altında
+yenilənir: növbə yalnız paylaşılan cache (REDIS_URL) ilə bütün işçilər
+üçün vahiddir, proses daxili cache-də hər işçinin öz növbəsi olur
+(events.W001).
+"""
+import math
+import time
+from contextlib import contextmanager
+
+from django.core import signing
+from django.core.cache import cache
+
+
+SALT = 'events.admission'
+TICKET_MAX_AGE = 2 * 60 * 60
+POLL_INTERVAL = 5
+LOCK_TIMEOUT = 5
+LOCK_WAIT = 2.0
+
+
+class QueueBusy(Exception):
+    """Növbənin kilidi LOCK_WAIT ərzində alınmadı"""
+
+
+def cookie_name(event_id):
+    return f'event_queue_{event_id}'
+
+
+def _state_key(event_id):
+    return f'events:queue:{event_id}:state'
+
+
+@contextmanager
+def _lock(event_id):
+    lock_key = f'{_state_key(event_id)}:lock'
+    deadline = time.monotonic() + LOCK_WAIT
+    while not cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            raise QueueBusy(event_id)
+        time.sleep(0.005)
+    try:
+        yield
+    finally:
+        cache.delete(lock_key)
+
+
+def _next_slot(event_id, rate):
+    """(sıra nömrəsi, buraxılma vaxtı, addım) - növbənin vəziyyəti kilid altında yenilənir"""
+    step = 60 / rate
+    with _lock(event_id):
+        number, last_slot, _ = cache.get(_state_key(event_id)) or (0, None, step)
+        now = time.time()
+        slot = now if last_slot is None else max(now, last_slot + step)
+        number += 1
+        cache.set(_state_key(event_id), (number, slot, step), timeout=TICKET_MAX_AGE)
+    return number, slot, step
+
+
+def issue_ticket(event, user):
+    """Yeni sıra nömrəsi və slotu ilə imzalı bilet"""
+    number, slot, _ = _next_slot(event.pk, event.queue_rate)
+    return signing.dumps(
+        {'e': event.pk, 'u': user.pk, 'n': number, 'a': slot},
+        salt=SALT,
+        compress=True,
+    )
+
+
+def read_ticket(value, event_id):
+    """İmzanı və müddəti yoxla; etibarsızdırsa None"""
+    if not value:
+        return None
+    try:
+        ticket = signing.loads(value, salt=SALT, max_age=TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if ticket.get('e') != event_id or 'a' not in ticket:
+        return None
+    return ticket
+
+
+def status(ticket):
+    """Gözləmə səhifəsi üçün: {'admitted', 'ahead', 'wait_seconds'}"""
+    wait = max(ticket['a'] - time.time(), 0)
+    if not wait:
+        return {'admitted': True, 'ahead': 0, 'wait_seconds': 0}
+    state = cache.get(_state_key(ticket['e']))
+    step = state[2] if state else None
+    return {
+        'admitted': False,
+        'ahead': math.ceil(wait / step) if step else None,
+        'wait_seconds': math.ceil(wait),
+    }
@@ -0,0 +1,19 @@
+"""Tədbir modulunun sistem yoxlamaları (manage.py check, runserver)"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from apps.core import stamps
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    """Yer saxlamaları, virtual növbə və bilet ləğvləri cache-dədir - proses daxili cache ilə hər işçi yalnız özününkünü görür"""
+    if settings.DEBUG or stamps.is_shared():
+        return []
+    return [
+        Warning(
+            'Standart cache işçi prosesləri arasında paylaşılmır.',
+            hint='REDIS_URL təyin edin: əks halda yer saxlamaları, virtual növbə və bilet ləğvləri hər işçidə ayrıdır.',
+            id='events.W001',
+        )
+    ]
@@ -1,28 +1,51 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
-from .models import Booking, EventReview
+from django.utils import timezone
+from apps.core import refdata
+from .models import EventReview, WaitlistEntry
 from apps.membership.models import Child
 
 
-class BookingForm(forms.ModelForm):
+class BookingForm(forms.Form):
+    """Bir və ya bir neçə uşağı eyni anda rezervasiya et"""
+    children = forms.ModelMultipleChoiceField(
+        queryset=Child.objects.none(),
+        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'}),
+        label='Uşaqlar',
+        error_messages={'required': 'Ən azı bir uşaq seçin.'}
+    )
+    notes = forms.CharField(
+        required=False,
+        label='Qeydlər',
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 3,
+            'placeholder': 'Əlavə qeydlər (isteğe bağlı)'
+        })
+    )
+    
     def __init__(self, *args, **kwargs):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
         
         if user:
             # Yalnız istifadəçinin uşaqlarını göstər
+            self.fields['children'].queryset = Child.objects.filter(parent__user=user)
+
+
+class WaitlistForm(forms.ModelForm):
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+        
+        if user:
             self.fields['child'].queryset = Child.objects.filter(parent__user=user)
             self.fields['child'].widget.attrs.update({'class': 'form-select'})
     
     class Meta:
-        model = Booking
-        fields = ['child', 'notes']
-        widgets = {
-            'notes': forms.Textarea(attrs={
-                'class': 'form-control',
-                'rows': 3,
-                'placeholder': 'Əlavə qeydlər (isteğe bağlı)'
-            }),
-        }
+        model = WaitlistEntry
+        fields = ['child']
 
 
 class EventReviewForm(forms.ModelForm):
@@ -70,11 +93,33 @@ class EventFilterForm(forms.Form):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        from .models import Event, EventCategory
+        from .models import Event
         
         # Dynamically set AGE_GROUP_CHOICES
         self.fields['age_group'].choices = [('', 'Bütün yaş qrupları')] + Event.AGE_GROUP_CHOICES
         
-        # Dynamically set category choices
-        categories = EventCategory.objects.all()
-        self.fields['category'].choices = self.CATEGORY_CHOICES + [(cat.id, cat.name) for cat in categories]
\ No newline at end of file
+        # Kateqoriyalar proses daxili cache-dən (apps.core.refdata)
+        self.fields['category'].choices = self.CATEGORY_CHOICES + refdata.event_categories.choices()
+    
+    @staticmethod
+    def day_start(day):
+        """Günün başlanğıcı TIME_ZONE (Asia/Baku) üzrə, aware datetime kimi"""
+        return timezone.make_aware(datetime.combine(day, time.min), timezone.get_default_timezone())
+    
+    def filter_queryset(self, events):
+        """Filtrləri indeksə uyğun tətbiq et.
+        
+        Tarixlər sütunu funksiyaya bükmədən yarımaçıq [date_from, date_to + 1 gün)
+        diapazonu kimi müqayisə olunur ki, (status, date) və
+        (category, age_group, date) indeksləri istifadə olunsun.
+        """
+        data = self.cleaned_data
+        if data.get('category'):
+            events = events.filter(category_id=data['category'])
+        if data.get('age_group'):
+            events = events.filter(age_group=data['age_group'])
+        if data.get('date_from'):
+            events = events.filter(date__gte=self.day_start(data['date_from']))
+        if data.get('date_to'):
+            events = events.filter(date__lt=self.day_start(data['date_to'] + timedelta(days=1)))
+        return events
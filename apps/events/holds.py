@@ -0,0 +1,176 @@
+"""Rezervasiya formu açıq olarkən yer üçün müvəqqəti (TTL) saxlama.
+
+Hər tədbirin saxlamaları bir açarda saxlanılır: {holder: (seats, expires_at)}.
+Vaxtı keçmiş saxlamalar həmin tədbirə hər müraciətdə tənbəl şəkildə
+silinir, açarın özü isə sonuncu saxlamanın vaxtı ilə birlikdə cache-dən
+düşür - bütün tədbirləri gəzən ayrıca təmizləyici lazım deyil.
+
+Saxlamalar yalnız paylaşılan cache (REDIS_URL) ilə bütün işçilərə görünür;
+proses daxili cache-də hər işçinin öz saxlamaları olur (events.W001).
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULT_TTL = 10 * 60
+
+
+def hold_ttl():
+    return getattr(settings, 'EVENT_SEAT_HOLD_TTL', DEFAULT_TTL)
+
+
+def holder_key(user):
+    return f'user:{user.pk}'
+
+
+class HoldStoreBusy(Exception):
+    """Tədbirin saxlama kilidi LOCK_WAIT ərzində alınmadı"""
+
+
+class BaseHoldStore:
+    """Saxlama anbarının ümumi məntiqi; alt siniflər yalnız saxlama/kilidi verir"""
+    
+    def __init__(self, clock=time.time):
+        self.clock = clock
+    
+    def _load(self, event_id):
+        raise NotImplementedError
+    
+    def _store(self, event_id, holds):
+        raise NotImplementedError
+    
+    @contextmanager
+    def _lock(self, event_id):
+        raise NotImplementedError
+    
+    def _active(self, event_id):
+        now = self.clock()
+        holds = self._load(event_id)
+        active = {key: value for key, value in holds.items() if value[1] > now}
+        return active, len(active) != len(holds)
+    
+    def acquire(self, event_id, holder, capacity, seats=1, ttl=None):
+        """Yer saxla və ya mövcud saxlamanı uzat.
+        
+        capacity - təsdiqlənmiş rezervasiyalardan sonra qalan yer sayı.
+        Başqalarının saxlamaları ilə birlikdə kifayət etmirsə False qaytarır.
+        """
+        ttl = hold_ttl() if ttl is None else ttl
+        with self._lock(event_id):
+            holds, pruned = self._active(event_id)
+            held_by_others = sum(value[0] for key, value in holds.items() if key != holder)
+            if held_by_others + seats > capacity:
+                if pruned:
+                    self._store(event_id, holds)
+                return False
+            holds[holder] = (seats, self.clock() + ttl)
+            self._store(event_id, holds)
+            return True
+    
+    def release(self, event_id, holder):
+        with self._lock(event_id):
+            holds, pruned = self._active(event_id)
+            if holds.pop(holder, None) is not None or pruned:
+                self._store(event_id, holds)
+    
+    def clear(self, event_id):
+        """Tədbirin bütün saxlamalarını burax (məsələn, tədbir ləğv ediləndə)"""
+        with self._lock(event_id):
+            self._store(event_id, {})
+    
+    def held(self, event_id, exclude=None):
+        """Aktiv saxlanılan yer sayı (exclude - bu sahibinki nəzərə alınmır)"""
+        holds, _ = self._active(event_id)
+        return sum(value[0] for key, value in holds.items() if key != exclude)
+    
+    def get(self, event_id, holder):
+        """Sahibin aktiv saxlaması: (seats, expires_at) və ya None"""
+        holds, _ = self._active(event_id)
+        return holds.get(holder)
+
+
+class CacheHoldStore(BaseHoldStore):
+    """Django cache üzərində; yalnız Redis kimi paylaşılan cache ilə bütün işçilər arasında ortaqdır"""
+    
+    LOCK_TIMEOUT = 5
+    LOCK_WAIT = 2.0
+    
+    def __init__(self, cache_alias='default', **kwargs):
+        super().__init__(**kwargs)
+        self.cache_alias = cache_alias
+    
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+    
+    def _key(self, event_id):
+        return f'events:holds:{event_id}'
+    
+    def _load(self, event_id):
+        return self.cache.get(self._key(event_id)) or {}
+    
+    def _store(self, event_id, holds):
+        if not holds:
+            self.cache.delete(self._key(event_id))
+            return
+        timeout = max(value[1] for value in holds.values()) - self.clock()
+        self.cache.set(self._key(event_id), holds, timeout=max(int(timeout) + 1, 1))
+    
+    @contextmanager
+    def _lock(self, event_id):
+        lock_key = f'{self._key(event_id)}:lock'
+        deadline = time.monotonic() + self.LOCK_WAIT
+        acquired = self.cache.add(lock_key, 1, timeout=self.LOCK_TIMEOUT)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.005)
+            acquired = self.cache.add(lock_key, 1, timeout=self.LOCK_TIMEOUT)
+        if not acquired:
+            raise HoldStoreBusy(event_id)
+        try:
+            yield
+        finally:
+            self.cache.delete(lock_key)
+
+
+class InMemoryHoldStore(BaseHoldStore):
+    """Testlər üçün proses daxili anbar; clock ötürərək vaxtı idarə etmək olar"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._holds = {}
+        self._mutex = threading.RLock()
+    
+    def _load(self, event_id):
+        return dict(self._holds.get(event_id, {}))
+    
+    def _store(self, event_id, holds):
+        if holds:
+            self._holds[event_id] = dict(holds)
+        else:
+            self._holds.pop(event_id, None)
+    
+    @contextmanager
+    def _lock(self, event_id):
+        with self._mutex:
+            yield
+
+
+_store = None
+
+
+def get_hold_store():
+    global _store
+    if _store is None:
+        _store = CacheHoldStore()
+    return _store
+
+
+def set_hold_store(store):
+    """Anbarı dəyiş (məsələn, testlərdə InMemoryHoldStore); əvvəlkini qaytarır"""
+    global _store
+    previous, _store = _store, store
+    return previous
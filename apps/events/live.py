@@ -0,0 +1,292 @@
+"""Boş yer sayının canlı yayımı (server-sent events, ASGI).
+
+Hər işçi prosesində bir SeatHub var. Yer sayı dəyişəndə publish() cache-də
+tədbirin möhürünü (stamp) yeniləyir; hər hub-ın tək izləyici tapşırığı
+abunə olunan tədbirlərin möhürlərini bir get_many ilə oxuyur və dəyişənlər
+üçün bir sorğu ilə yeni sayları alıb bütün abunəçilərə paylayır. Yəni
+sorğular abunəçi sayından asılı deyil - bir dəyişiklik, bir oxuma, N mesaj.
+
+Eyni prosesdəki dəyişikliklər izləyicini dərhal oyadır; digər işçilərdən
+gələnlər ən gec EVENT_LIVE_POLL_INTERVAL saniyə sonra görünür (bunun üçün
+REDIS_URL ilə paylaşılan cache lazımdır).
+"""
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from .models import Event
+
+
+STAMP_TTL = 24 * 60 * 60
+# Saxlamaların (holds) vaxtı səssizcə bitir - arabir hamısı yenidən oxunur
+REFRESH_EVERY = 30
+
+_hubs = {}
+_hubs_lock = threading.Lock()
+
+
+def poll_interval():
+    return getattr(settings, 'EVENT_LIVE_POLL_INTERVAL', 1)
+
+
+def heartbeat_interval():
+    return getattr(settings, 'EVENT_LIVE_HEARTBEAT', 20)
+
+
+def stamp_key(event_id):
+    return f'events:seats:stamp:{event_id}'
+
+
+def publish(event_id):
+    """Tədbirin yer sayı dəyişdi: möhürü yenilə və bu prosesin hub-larını oyat"""
+    cache.set(stamp_key(event_id), time.time_ns(), STAMP_TTL)
+    with _hubs_lock:
+        hubs = list(_hubs.values())
+    for hub in hubs:
+        hub.notify_threadsafe(event_id)
+
+
+def seats_changed(event_id):
+    """publish()-i tranzaksiya commit olunandan sonra çağır"""
+    transaction.on_commit(lambda: publish(event_id))
+
+
+def load_spots(event_ids):
+    """{event_id: {'spots': .., 'full': .., 'status': ..}} - bir sorğu"""
+    from .holds import get_hold_store
+
+    store = get_hold_store()
+    rows = Event.objects.filter(pk__in=event_ids).values_list(
+        'pk', 'max_participants', 'confirmed_count', 'status'
+    )
+    snapshot = {}
+    for pk, max_participants, confirmed_count, status in rows:
+        spots = max(max_participants - confirmed_count - store.held(pk), 0)
+        snapshot[pk] = {'spots': spots, 'full': spots == 0, 'status': status}
+    return snapshot
+
+
+def max_events():
+    return getattr(settings, 'EVENT_LIVE_MAX_EVENTS', 50)
+
+
+def parse_ids(raw):
+    """'1,2,3' -> [1, 2, 3]; yanlış və ya həddən çox olduqda None"""
+    try:
+        event_ids = sorted({int(value) for value in raw.split(',') if value})
+    except ValueError:
+        return None
+    if not event_ids or len(event_ids) > max_events():
+        return None
+    return event_ids
+
+
+def format_message(event_id, data):
+    payload = json.dumps({'event': event_id, **data})
+    return f'event: seats\ndata: {payload}\n\n'
+
+
+class Subscription:
+    """Bir SSE bağlantısı. Gözləyən yeniləmələr tədbirə görə birləşir -
+    yavaş müştəri üçün növbə böyümür, yalnız son vəziyyət saxlanılır."""
+    __slots__ = ('event_ids', 'pending', 'ready')
+
+    def __init__(self, event_ids):
+        self.event_ids = event_ids
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, event_id, data):
+        self.pending[event_id] = data
+        self.ready.set()
+
+    def drain(self):
+        self.ready.clear()
+        pending, self.pending = self.pending, {}
+        return pending
+
+
+class SeatHub:
+    """Bir event loop-un abunəçiləri və onların ortaq izləyicisi"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.subscribers = {}
+        self.snapshot = {}
+        self.stamps = {}
+        self.dirty = set()
+        self.wakeup = asyncio.Event()
+        self.watcher = None
+
+    def subscribe(self, event_ids):
+        subscription = Subscription(event_ids)
+        for event_id in event_ids:
+            self.subscribers.setdefault(event_id, set()).add(subscription)
+            if event_id in self.snapshot:
+                subscription.push(event_id, self.snapshot[event_id])
+            else:
+                self.dirty.add(event_id)
+        if self.dirty:
+            self.wakeup.set()
+        if self.watcher is None or self.watcher.done():
+            self.watcher = self.loop.create_task(self.watch())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        for event_id in subscription.event_ids:
+            subscribers = self.subscribers.get(event_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[event_id]
+                self.snapshot.pop(event_id, None)
+                self.stamps.pop(event_id, None)
+
+    def notify_threadsafe(self, event_id):
+        """İstənilən axından çağırıla bilər (sinxron view-lar, arxa plan işləri)"""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._mark_dirty, event_id)
+
+    def _mark_dirty(self, event_id):
+        if event_id in self.subscribers:
+            self.dirty.add(event_id)
+            self.wakeup.set()
+
+    async def watch(self):
+        rounds = 0
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), poll_interval())
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            rounds += 1
+
+            event_ids = list(self.subscribers)
+            if not event_ids:
+                break
+            stamps = await cache.aget_many([stamp_key(event_id) for event_id in event_ids])
+            changed = set(self.dirty)
+            self.dirty.clear()
+            for event_id in event_ids:
+                stamp = stamps.get(stamp_key(event_id))
+                if stamp != self.stamps.get(event_id):
+                    self.stamps[event_id] = stamp
+                    changed.add(event_id)
+            if rounds % REFRESH_EVERY == 0:
+                changed.update(event_ids)
+            changed.intersection_update(self.subscribers)
+            if changed:
+                await self.refresh(changed)
+        # Abunəçi qalmadı - loop bağlananda hub yaddaşda qalmasın
+        with _hubs_lock:
+            if _hubs.get(self.loop) is self and not self.subscribers:
+                del _hubs[self.loop]
+
+    async def refresh(self, event_ids):
+        snapshot = await sync_to_async(load_spots)(list(event_ids))
+        for event_id, data in snapshot.items():
+            if self.snapshot.get(event_id) == data:
+                continue
+            self.snapshot[event_id] = data
+            for subscription in self.subscribers.get(event_id, ()):
+                subscription.push(event_id, data)
+
+
+def is_available(request):
+    """Canlı axın yalnız ASGI-də; WSGI-də səhifələr canlı yeniləməsiz qalır (sorğu-sorğu polling yox)"""
+    return isinstance(request, ASGIRequest)
+
+
+def get_hub():
+    """Cari event loop-un hub-ı (hər işçi prosesində adətən bir dənə)"""
+    loop = asyncio.get_running_loop()
+    with _hubs_lock:
+        hub = _hubs.get(loop)
+        if hub is None:
+            hub = _hubs[loop] = SeatHub(loop)
+    return hub
+
+
+async def stream(event_ids, hub=None):
+    """SSE mesajları: əvvəl cari vəziyyət, sonra yalnız dəyişikliklər"""
+    hub = hub or get_hub()
+    subscription = hub.subscribe(event_ids)
+    try:
+        yield f'retry: {poll_interval() * 5000}\n\n'
+        while True:
+            try:
+                await asyncio.wait_for(subscription.ready.wait(), heartbeat_interval())
+            except asyncio.TimeoutError:
+                # Proksilər boş bağlantını bağlamasın
+                yield ': ping\n\n'
+                continue
+            for event_id, data in subscription.drain().items():
+                yield format_message(event_id, data)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+class SeatStreamApp:
+    """ASGI qatı: SSE sorğusunu Django middleware zəncirindən keçirmədən cavablandırır.
+    
+    Axın açıq məlumatdır (sessiya, CSRF lazım deyil), middleware isə hər
+    bağlantıya sinxron keçidlər və request obyektləri əlavə edir - minlərlə
+    boş bağlantıda bu həm qoşulmanı, həm yaddaşı bahalaşdırır. Qalan bütün
+    sorğular olduğu kimi Django tətbiqinə ötürülür.
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.path = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            if self.path is None:
+                self.path = reverse('events:seat_stream')
+            if scope['path'] == self.path:
+                return await self.serve(scope, receive, send)
+        return await self.application(scope, receive, send)
+
+    async def serve(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        event_ids = parse_ids(query.get('ids', [''])[0])
+        if event_ids is None:
+            await send({'type': 'http.response.start', 'status': 400,
+                        'headers': [(b'content-type', b'application/json')]})
+            await send({'type': 'http.response.body', 'body': b'{"error": "ids"}'})
+            return
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-store'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+
+        async def pump():
+            async for chunk in stream(event_ids):
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+        async def wait_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        # Müştəri gedəndə axın ləğv olunur, finally isə abunəni silir
+        pump_task = asyncio.ensure_future(pump())
+        disconnect_task = asyncio.ensure_future(wait_disconnect())
+        try:
+            await asyncio.wait({pump_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (pump_task, disconnect_task):
+                task.cancel()
+            await asyncio.gather(pump_task, disconnect_task, return_exceptions=True)
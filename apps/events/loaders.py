@@ -0,0 +1,67 @@
+"""event_detail üçün sabit sayda sorğu ilə məlumat yükləyicisi.
+
+Tədbir, kateqoriya, reytinq xülasəsi və baxanın öz rəyi bir sorğuda,
+son rəylər bir sorğuda, baxanın rezervasiyası bir sorğuda gəlir; gözləmə
+siyahısı yalnız tədbir dolu olduqda oxunur.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from django.db.models import Count, FilteredRelation, OuterRef, Q, Subquery
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from .models import Booking, Event, EventReview, WaitlistEntry
+
+
+@dataclass
+class EventPage:
+    event: Event
+    reviews: List[EventReview] = field(default_factory=list)
+    user_booking: Optional[Booking] = None
+    user_review: Optional[EventReview] = None
+    waitlist_entries: Optional[List[WaitlistEntry]] = None
+    
+    @property
+    def rating_summary(self):
+        return getattr(self.event, 'rating_summary', None)
+    
+    @property
+    def can_review(self):
+        # Rəy yaza bilər əgər tədbirə qatılıbsa və hələ rəy yazmayıbsa
+        return bool(
+            self.user_booking
+            and self.user_booking.attended
+            and not self.user_review
+            and self.event.date < timezone.now()
+        )
+
+
+def load_event_page(pk, user, reviews_limit=5):
+    """Anonim: 2 sorğu; daxil olmuş: 3, tədbir doludursa 4"""
+    queryset = Event.objects.select_related('category', 'rating_summary')
+    if user.is_authenticated:
+        queryset = queryset.annotate(
+            viewer_review=FilteredRelation('reviews', condition=Q(reviews__user=user)),
+        ).select_related('viewer_review')
+    event = get_object_or_404(queryset, pk=pk)
+    
+    page = EventPage(event=event)
+    page.reviews = list(event.reviews.select_related('user')[:reviews_limit])
+    if user.is_authenticated:
+        # FilteredRelation boş qaldıqda atribut təyin olunmur
+        page.user_review = getattr(event, 'viewer_review', None)
+        page.user_booking = Booking.objects.filter(event=event, user=user).first()
+        if event.is_full:
+            # Sıra nömrəsi eyni sorğuda (queue indeksi ilə) - qeyd başına COUNT yoxdur
+            ahead = (
+                WaitlistEntry.objects.filter(event_id=OuterRef('event_id'), status='waiting', id__lte=OuterRef('id'))
+                .order_by().values('event_id').annotate(total=Count('pk')).values('total')
+            )
+            page.waitlist_entries = list(
+                WaitlistEntry.objects.filter(event=event, user=user, status='waiting')
+                .annotate(queue_position=Subquery(ahead))
+                .select_related('child')
+                .order_by('id')
+            )
+    return page
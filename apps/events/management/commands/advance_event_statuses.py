@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.events.scheduler import advance_event_statuses
+
+
+class Command(BaseCommand):
+    help = 'Vaxtı çatmış tədbirləri "Davam edir" və "Tamamlandı" statusuna keçirir'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Saniyə; verilərsə əmr dayandırılana qədər dövri işləyir')
+    
+    def handle(self, *args, **options):
+        while True:
+            started, completed = advance_event_statuses()
+            self.stdout.write(f'Başlayan: {started}, bitən: {completed}')
+            if not options['interval']:
+                break
+            connections.close_all()
+            time.sleep(options['interval'])
@@ -0,0 +1,96 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from apps.events import services
+from apps.events.models import Event, EventCategory, Booking
+from apps.membership.models import MemberProfile, Child
+
+
+class Command(BaseCommand):
+    help = ('Eyni tədbirə paralel rezervasiya stress testi: '
+            'oversell olmadığını yoxlayır və saniyədə rezervasiya sayını göstərir')
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--bookers', type=int, default=400, help='Rezervasiya edən uşaq sayı')
+        parser.add_argument('--capacity', type=int, default=150)
+        parser.add_argument('--keep', action='store_true', help='Test məlumatlarını silmə')
+    
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.settings_dict['NAME'] in ('', ':memory:'):
+            raise CommandError('Yaddaşdakı SQLite bazası axınlar arasında paylaşılmır.')
+        
+        threads = options['threads']
+        capacity = options['capacity']
+        stamp = int(time.time() * 1000)
+        
+        category, _ = EventCategory.objects.get_or_create(name='bench')
+        event = Event.objects.create(
+            title=f'bench-{stamp}', description='bench', category=category, image='bench.jpg',
+            date=timezone.now() + timedelta(days=1), duration=60, location='bench',
+            age_group='all', max_participants=capacity, price=0,
+        )
+        user = User.objects.create(username=f'bench-{stamp}')
+        profile = MemberProfile.objects.create(
+            user=user, phone='-', address='-', emergency_contact='-', emergency_phone='-'
+        )
+        children = Child.objects.bulk_create([
+            Child(parent=profile, name=f'bench{i}', surname='-', birth_date=date(2018, 1, 1), gender='M')
+            for i in range(options['bookers'])
+        ])
+        # Hər uşaq iki dəfə cəhd edir ki, dublikat yolu da yüklənsin
+        attempts = [child for child in children for _ in range(2)]
+        
+        results = {services.BOOKED: 0, services.FULL: 0, services.DUPLICATE: 0, services.CLOSED: 0}
+        errors = []
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads)
+        
+        def worker(chunk):
+            local = dict.fromkeys(results, 0)
+            try:
+                start_gate.wait()
+                for child in chunk:
+                    local[services.book_seat(event, user, child).status] += 1
+            except Exception as exc:  # noqa: BLE001 - hesabatda göstərilir
+                errors.append(repr(exc))
+            finally:
+                connections.close_all()
+            with lock:
+                for key, value in local.items():
+                    results[key] += value
+        
+        chunks = [attempts[i::threads] for i in range(threads)]
+        pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        began = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        
+        event.refresh_from_db()
+        stored = Booking.objects.filter(event=event, status='confirmed').count()
+        
+        self.stdout.write(f'Axınlar: {threads}, cəhdlər: {len(attempts)}, tutum: {capacity}')
+        self.stdout.write(f'Nəticələr: {results}')
+        self.stdout.write(f'Müddət: {elapsed:.2f}s, {len(attempts) / elapsed:.0f} cəhd/s, '
+                          f'{results[services.BOOKED] / elapsed:.0f} rezervasiya/s')
+        self.stdout.write(f'Sayğac: {event.confirmed_count}, təsdiqlənmiş sətirlər: {stored}')
+        
+        oversold = stored > capacity or event.confirmed_count != stored
+        if not options['keep']:
+            event.delete()
+            user.delete()
+        
+        if errors:
+            raise CommandError(f'{len(errors)} axın xəta ilə bitdi: {errors[0]}')
+        if oversold:
+            raise CommandError('OVERSELL: tutum aşıldı və ya sayğac uyğun deyil!')
+        self.stdout.write(self.style.SUCCESS('Oversell yoxdur.'))
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import resource
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from alisa_club.asgi import application
+from apps.events import live
+from apps.events.models import Event, EventCategory
+
+
+def rss_mb():
+    """Prosesin cari yaddaşı (MB); /proc yoxdursa maksimum RSS"""
+    try:
+        with open('/proc/self/statm') as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Connection:
+    """Yaddaşda ASGI müştərisi: SSE cavabını oxuyur, mesajların vaxtını qeyd edir"""
+
+    def __init__(self, path, query):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query.encode(), 'root_path': '', 'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+        }
+        self.status = None
+        self.messages = 0
+        self.last_message_at = None
+        self.first_message = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.sent_request = False
+
+    async def receive(self):
+        if not self.sent_request:
+            self.sent_request = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+        elif message['type'] == 'http.response.body':
+            count = message.get('body', b'').count(b'event: seats')
+            if count:
+                self.messages += count
+                self.last_message_at = time.perf_counter()
+                self.first_message.set()
+
+
+class Command(BaseCommand):
+    help = ('Canlı yer yayımı (SSE) benchmark-ı: bir işçidə minlərlə boş abunəçi, '
+            'yaddaş və bir dəyişikliyin hamıya çatma müddəti')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=5000)
+        parser.add_argument('--idle', type=float, default=3.0, help='Boş gözləmə (saniyə)')
+        parser.add_argument('--changes', type=int, default=5)
+        parser.add_argument('--keep', action='store_true', help='Test məlumatlarını silmə')
+
+    def handle(self, *args, **options):
+        category, _ = EventCategory.objects.get_or_create(name='bench')
+        event = Event.objects.create(
+            title=f'bench-stream-{int(time.time())}', description='bench', category=category,
+            image='bench.jpg', date=timezone.now() + timedelta(days=1), duration=60,
+            location='bench', age_group='all', max_participants=10 ** 6, price=0,
+        )
+        try:
+            asyncio.run(self.run(event, options))
+        finally:
+            if not options['keep']:
+                event.delete()
+
+    async def run(self, event, options):
+        total = options['subscribers']
+        path = reverse('events:seat_stream')
+
+        baseline = rss_mb()
+        began = time.perf_counter()
+        connections = [Connection(path, f'ids={event.pk}') for _ in range(total)]
+        tasks = [
+            asyncio.create_task(application(conn.scope, conn.receive, conn.send))
+            for conn in connections
+        ]
+        await asyncio.gather(*(conn.first_message.wait() for conn in connections))
+        connected = time.perf_counter() - began
+        per_subscriber = (rss_mb() - baseline) * 1024 / total
+
+        bad = [conn.status for conn in connections if conn.status != 200]
+        if bad:
+            raise CommandError(f'{len(bad)} bağlantı uğursuz oldu (status {bad[0]})')
+
+        self.stdout.write(f'Abunəçilər: {total}, qoşulma: {connected:.2f}s')
+        self.stdout.write(f'Yaddaş: {rss_mb() - baseline:.1f} MB (~{per_subscriber:.1f} KB/abunəçi)')
+
+        # Boş dövr: izləyici saniyədə bir cache oxuyur, event loop gecikməsi ölçülür
+        lag = 0.0
+        idle_until = time.perf_counter() + options['idle']
+        while time.perf_counter() < idle_until:
+            tick = time.perf_counter()
+            await asyncio.sleep(0.05)
+            lag = max(lag, time.perf_counter() - tick - 0.05)
+        self.stdout.write(f'Boş dövrdə maksimum loop gecikməsi: {lag * 1000:.1f} ms')
+
+        latencies = []
+        for _ in range(options['changes']):
+            expected = [conn.messages + 1 for conn in connections]
+            changed_at = time.perf_counter()
+            # adjust_confirmed_count commit-dən sonra live.publish çağırır
+            await sync_to_async(Event.adjust_confirmed_count)(event.pk, 1)
+            while any(conn.messages < want for conn, want in zip(connections, expected)):
+                await asyncio.sleep(0.005)
+            latencies.append(max(conn.last_message_at for conn in connections) - changed_at)
+
+        latencies.sort()
+        self.stdout.write(
+            f'Bir dəyişiklik -> {total} mesaj: median {latencies[len(latencies) // 2] * 1000:.1f} ms, '
+            f'maks {latencies[-1] * 1000:.1f} ms'
+        )
+
+        for conn in connections:
+            conn.disconnected.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        leaked = sum(len(subs) for hub in live._hubs.values() for subs in hub.subscribers.values())
+        if leaked:
+            raise CommandError(f'Bağlantılar bağlandı, amma {leaked} abunə qaldı')
+        self.stdout.write(self.style.SUCCESS('Bütün abunələr bağlantı ilə birlikdə silindi.'))
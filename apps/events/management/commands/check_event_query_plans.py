@@ -0,0 +1,60 @@
+import itertools
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.events.forms import EventFilterForm
+from apps.events.models import Event, EventCategory
+
+
+class Command(BaseCommand):
+    help = ('event_list üçün EventFilterForm-un bütün filtr kombinasiyalarının sorğu planını '
+            'yoxlayır; hər hansı biri events_event cədvəlini tam skan edirsə xəta ilə bitir')
+    
+    def full_scan_pattern(self):
+        table = re.escape(Event._meta.db_table)
+        if connection.vendor == 'postgresql':
+            return re.compile(rf'Seq Scan on {table}\b')
+        if connection.vendor == 'sqlite':
+            return re.compile(rf'\bSCAN {table}\b')
+        raise CommandError(f'{connection.vendor} üçün plan analizi dəstəklənmir.')
+    
+    def handle(self, *args, **options):
+        pattern = self.full_scan_pattern()
+        today = timezone.localdate()
+        category = EventCategory.objects.values_list('pk', flat=True).first() or 1
+        
+        values = {
+            'category': ['', str(category)],
+            'age_group': ['', Event.AGE_GROUP_CHOICES[0][0]],
+            'date_from': ['', today.isoformat()],
+            'date_to': ['', (today + timedelta(days=30)).isoformat()],
+        }
+        failures = []
+        checked = 0
+        for combination in itertools.product(*values.values()):
+            data = dict(zip(values, combination))
+            form = EventFilterForm(data)
+            form.fields['category'].choices = [('', ''), (str(category), '')]
+            if not form.is_valid():
+                raise CommandError(f'Form etibarsızdır: {data} {form.errors}')
+            
+            events = form.filter_queryset(
+                Event.objects.with_capacity().upcoming()
+            )
+            # Səhifə sorğusu və Paginator-un COUNT(*) sorğusu
+            for label, queryset in (('page', events[:9]), ('count', events.order_by().values('pk'))):
+                plan = queryset.explain()
+                checked += 1
+                if pattern.search(plan):
+                    failures.append((label, data, plan))
+        
+        for label, data, plan in failures:
+            active = {key: value for key, value in data.items() if value}
+            self.stderr.write(f'[{label}] {active or "filtrsiz"}:\n{plan}\n')
+        if failures:
+            raise CommandError(f'{len(failures)}/{checked} sorğu cədvəli tam skan edir.')
+        self.stdout.write(self.style.SUCCESS(f'{checked} sorğunun hamısı indeksdən istifadə edir.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from apps.events.models import EventSeries
+
+
+class Command(BaseCommand):
+    help = 'Aktiv tədbir seriyalarının yaxın həftələrdəki tədbirlərini yaradır (cron üçün)'
+    
+    def handle(self, *args, **options):
+        total = 0
+        for series in EventSeries.objects.filter(is_active=True):
+            created = series.materialize()
+            total += len(created)
+            if created:
+                self.stdout.write(f'{series}: {len(created)} tədbir')
+        
+        self.stdout.write(self.style.SUCCESS(f'Cəmi {total} tədbir yaradıldı.'))
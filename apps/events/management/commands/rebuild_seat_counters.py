@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from apps.events.models import Event, Booking
+
+
+class Command(BaseCommand):
+    help = 'Event.confirmed_count sayğaclarını rezervasiyalardan yenidən hesablayır'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', dest='event_ids',
+                            help='Yalnız göstərilən tədbir(lər)i yenilə')
+    
+    def handle(self, *args, **options):
+        confirmed = (
+            Booking.objects.filter(event=OuterRef('pk'), status__in=Booking.SEAT_STATUSES)
+            .order_by()
+            .values('event')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        events = Event.objects.all()
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+        
+        with transaction.atomic():
+            updated = events.update(
+                confirmed_count=Coalesce(Subquery(confirmed), Value(0))
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f'{updated} tədbirin sayğacı yeniləndi.'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:21
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_confirmed_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Booking = apps.get_model('events', 'Booking')
+    confirmed = (
+        Booking.objects.filter(event=OuterRef('pk'), status='confirmed')
+        .order_by()
+        .values('event')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Event.objects.update(confirmed_count=Coalesce(Subquery(confirmed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Təsdiqlənmiş yer sayı'),
+        ),
+        migrations.RunPython(fill_confirmed_count, migrations.RunPython.noop),
+    ]
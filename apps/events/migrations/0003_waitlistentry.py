@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_confirmed_count'),
+        ('membership', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('waiting', 'Gözləyir'), ('promoted', 'Rezervasiya edildi'), ('cancelled', 'Ləğv edildi')], default='waiting', max_length=20, verbose_name='Status')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Qoşulma tarixi')),
+                ('promoted_at', models.DateTimeField(blank=True, null=True, verbose_name='Rezervasiya tarixi')),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='membership.child', verbose_name='Uşaq')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='events.event', verbose_name='Tədbir')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL, verbose_name='İstifadəçi')),
+            ],
+            options={
+                'verbose_name': 'Gözləmə Siyahısı',
+                'verbose_name_plural': 'Gözləmə Siyahıları',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['event', 'status', 'id'], name='events_waitlist_queue_idx')],
+                'unique_together': {('event', 'child')},
+            },
+        ),
+    ]
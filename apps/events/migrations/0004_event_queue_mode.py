@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='queue_mode',
+            field=models.BooleanField(default=False, help_text='Tez satılan tədbirlər: rezervasiyaya virtual növbə ilə buraxılır', verbose_name='Növbə rejimi'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='queue_rate',
+            field=models.PositiveIntegerField(default=30, help_text='Dəqiqədə rezervasiya səhifəsinə buraxılan istifadəçi sayı', verbose_name='Növbə sürəti'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def fill_summaries(apps, schema_editor):
+    Summary = apps.get_model('events', 'EventRatingSummary')
+    rows = (
+        apps.get_model('events', 'EventReview').objects.order_by()
+        .values('event_id')
+        .annotate(
+            count=Count('pk'),
+            total=Sum('rating'),
+            **{f'star_{star}': Count('pk', filter=Q(rating=star)) for star in range(1, 6)}
+        )
+    )
+    Summary.objects.bulk_create([Summary(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Rəy sayı')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Qiymətlərin cəmi')),
+                ('star_1', models.PositiveIntegerField(default=0)),
+                ('star_2', models.PositiveIntegerField(default=0)),
+                ('star_3', models.PositiveIntegerField(default=0)),
+                ('star_4', models.PositiveIntegerField(default=0)),
+                ('star_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating_summary', to='events.event', verbose_name='Tədbir')),
+            ],
+            options={
+                'verbose_name': 'Tədbir Reytinqi',
+                'verbose_name_plural': 'Tədbir Reytinqləri',
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_eventratingsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Başlıq')),
+                ('description', models.TextField(verbose_name='Təsvir')),
+                ('image', models.ImageField(upload_to='events/', verbose_name='Şəkil')),
+                ('duration', models.IntegerField(help_text='Dəqiqə ilə', verbose_name='Müddət')),
+                ('location', models.CharField(max_length=200, verbose_name='Yer')),
+                ('age_group', models.CharField(choices=[('0-3', '0-3 yaş'), ('3-6', '3-6 yaş'), ('6-9', '6-9 yaş'), ('9-12', '9-12 yaş'), ('12+', '12+ yaş'), ('all', 'Bütün yaşlar')], max_length=10, verbose_name='Yaş qrupu')),
+                ('max_participants', models.IntegerField(verbose_name='Maksimum iştirakçı sayı')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Qiymət')),
+                ('requirements', models.TextField(blank=True, verbose_name='Tələblər')),
+                ('what_to_bring', models.TextField(blank=True, verbose_name='Nə gətirmək lazımdır')),
+                ('weekdays', models.CharField(help_text='Vergüllə: 0=Bazar ertəsi ... 6=Bazar, məsələn "1,3"', max_length=20, verbose_name='Həftənin günləri')),
+                ('interval_weeks', models.PositiveSmallIntegerField(default=1, verbose_name='Hər neçə həftədən bir')),
+                ('start_time', models.TimeField(verbose_name='Başlama saatı')),
+                ('starts_on', models.DateField(verbose_name='Başlama tarixi')),
+                ('ends_on', models.DateField(blank=True, null=True, verbose_name='Bitmə tarixi')),
+                ('window_weeks', models.PositiveSmallIntegerField(default=8, verbose_name='Neçə həftə əvvəlcədən yaradılsın')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Aktiv')),
+                ('generated_until', models.DateField(blank=True, editable=False, null=True, verbose_name='Yaradılıb (tarixədək)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='events.eventcategory', verbose_name='Kateqoriya')),
+            ],
+            options={
+                'verbose_name': 'Tədbir Seriyası',
+                'verbose_name_plural': 'Tədbir Seriyaları',
+                'ordering': ['title'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='events.eventseries', verbose_name='Seriya'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('series', 'date'), name='events_series_date_unique'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:31
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def fill_ends_at(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    batch = []
+    for event in Event.objects.only('pk', 'date', 'duration').iterator(chunk_size=1000):
+        event.ends_at = event.date + timedelta(minutes=event.duration)
+        batch.append(event)
+        if len(batch) >= 1000:
+            Event.objects.bulk_update(batch, ['ends_at'])
+            batch = []
+    Event.objects.bulk_update(batch, ['ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_eventseries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Bitmə vaxtı'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'ends_at'], name='events_status_ends_idx'),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+    ]
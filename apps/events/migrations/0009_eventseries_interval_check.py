@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:07
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def fix_zero_interval(apps, schema_editor):
+    EventSeries = apps.get_model('events', 'EventSeries')
+    EventSeries.objects.filter(interval_weeks=0).update(interval_weeks=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_ends_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventseries',
+            name='interval_weeks',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Hər neçə həftədən bir'),
+        ),
+        migrations.RunPython(fix_zero_interval, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventseries',
+            constraint=models.CheckConstraint(condition=models.Q(('interval_weeks__gte', 1)), name='events_series_interval_gte_1'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:10
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def fix_zero_rate(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Event.objects.filter(queue_rate=0).update(queue_rate=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_eventseries_interval_check'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='queue_rate',
+            field=models.PositiveIntegerField(default=30, help_text='Dəqiqədə rezervasiya səhifəsinə buraxılan istifadəçi sayı', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Növbə sürəti'),
+        ),
+        migrations.RunPython(fix_zero_rate, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,13 @@
-from django.db import models
+from datetime import datetime, timedelta
+
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.contrib.auth.models import User
+from apps.core.models import RatingSummary
 from apps.membership.models import Child
 
 
@@ -20,6 +27,18 @@ class EventCategory(models.Model):
         return self.name
 
 
+class EventQuerySet(models.QuerySet):
+    def upcoming(self):
+        """Hələ başlamamış tədbirlər. Status advance_event_statuses ilə dəyişir; iş
+        işləməsə də keçmiş tədbir görünməsin deyə tarix də yoxlanılır ((status, date) indeksi)"""
+        return self.filter(status='upcoming', date__gte=timezone.now())
+    
+    def with_capacity(self):
+        """Siyahılar üçün: kateqoriya sətir başına sorğusuz; boş yer (available_spots)
+        confirmed_count sahəsindən və cache-dəki saxlamalardan hesablanır"""
+        return self.select_related('category')
+
+
 class Event(models.Model):
     """Tədbir modeli"""
     AGE_GROUP_CHOICES = [
@@ -51,13 +70,31 @@ class Event(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming', verbose_name='Status')
     requirements = models.TextField(blank=True, verbose_name='Tələblər')
     what_to_bring = models.TextField(blank=True, verbose_name='Nə gətirmək lazımdır')
+    ends_at = models.DateTimeField(editable=False, null=True, verbose_name='Bitmə vaxtı')
+    confirmed_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Təsdiqlənmiş yer sayı')
+    series = models.ForeignKey('EventSeries', on_delete=models.SET_NULL, blank=True, null=True,
+                               related_name='events', verbose_name='Seriya')
+    queue_mode = models.BooleanField(default=False, verbose_name='Növbə rejimi',
+                                     help_text='Tez satılan tədbirlər: rezervasiyaya virtual növbə ilə buraxılır')
+    queue_rate = models.PositiveIntegerField(default=30, validators=[MinValueValidator(1)], verbose_name='Növbə sürəti',
+                                             help_text='Dəqiqədə rezervasiya səhifəsinə buraxılan istifadəçi sayı')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EventQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Tədbir'
         verbose_name_plural = 'Tədbirlər'
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['status', 'date'], name='events_status_date_idx'),
+            models.Index(fields=['category', 'age_group', 'date'], name='events_cat_age_date_idx'),
+            models.Index(fields=['status', 'ends_at'], name='events_status_ends_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'date'], name='events_series_date_unique'),
+        ]
     
     def __str__(self):
         return self.title
@@ -65,9 +102,29 @@ class Event(models.Model):
     def get_absolute_url(self):
         return reverse('events:event_detail', kwargs={'pk': self.pk})
     
+    def save(self, *args, **kwargs):
+        self.ends_at = self.compute_ends_at()
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            # confirmed_count yalnız F() ilə dəyişir - admin formu açıq olarkən edilən
+            # rezervasiyaları köhnə dəyərlə üstələməmək üçün tam yazıda da saxlanılmır
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'confirmed_count'
+            ]
+        super().save(*args, **kwargs)
+    
+    def compute_ends_at(self):
+        return self.date + timedelta(minutes=self.duration)
+    
+    @cached_property
+    def held_seats(self):
+        """Rezervasiya formunda müvəqqəti saxlanılan yerlər (cache, DB sorğusu yoxdur)"""
+        from .holds import get_hold_store
+        return get_hold_store().held(self.pk)
+    
     @property
     def available_spots(self):
-        return self.max_participants - self.bookings.filter(status='confirmed').count()
+        return self.max_participants - self.confirmed_count - self.held_seats
     
     @property
     def is_full(self):
@@ -75,7 +132,177 @@ class Event(models.Model):
     
     @property
     def booking_count(self):
-        return self.bookings.filter(status='confirmed').count()
+        return self.confirmed_count
+    
+    @classmethod
+    def reserve_seats(cls, event_id, count=1, held=0):
+        """Yalnız kifayət qədər boş yer varsa sayğacı artır - tək şərti UPDATE.
+        
+        Eyni anda gələn sorğular sətir kilidində növbələşir, buna görə
+        max_participants heç vaxt aşılmır. held - başqalarının müvəqqəti
+        saxladığı yerlər, onlar da boş sayılmır. Uğurlu olduqda True qaytarır.
+        """
+        reserved = cls.objects.filter(
+            pk=event_id,
+            confirmed_count__lte=F('max_participants') - count - held,
+        ).update(confirmed_count=F('confirmed_count') + count) == 1
+        if reserved:
+            cls.on_seats_changed(event_id)
+        return reserved
+    
+    @classmethod
+    def adjust_confirmed_count(cls, event_id, delta):
+        """Sayğacı yarışsız dəyiş (UPDATE ... SET confirmed_count = confirmed_count + delta)"""
+        if delta:
+            cls.objects.filter(pk=event_id).update(confirmed_count=F('confirmed_count') + delta)
+            cls.on_seats_changed(event_id)
+    
+    @staticmethod
+    def on_seats_changed(event_id):
+        """Commit-dən sonra canlı yer yayımına (SSE) və uşaq lentlərinə xəbər ver"""
+        from apps.membership.feed import bump_catalog
+        from .live import seats_changed
+        seats_changed(event_id)
+        # Sayğac update() ilə dəyişir, siqnal yoxdur - dolan tədbir lentlərdən çıxsın
+        transaction.on_commit(bump_catalog)
+    
+    @staticmethod
+    def on_seats_freed(event_id):
+        """Tranzaksiya bitdikdən sonra boşalan yerləri gözləmə siyahısına ver"""
+        from .services import promote_waitlist
+        transaction.on_commit(lambda: promote_waitlist(event_id))
+
+
+class EventSeries(models.Model):
+    """Təkrarlanan tədbir seriyası (məsələn, həftəlik dərslər).
+    
+    Tədbirlər adi Event sətirləri kimi yaradılır, buna görə bütün siyahılar,
+    rezervasiyalar və şablonlar dəyişmədən işləyir.
+    """
+    # Seriyadan hər tədbirə köçürülən sahələr
+    TEMPLATE_FIELDS = [
+        'title', 'description', 'category', 'image', 'duration', 'location',
+        'age_group', 'max_participants', 'price', 'requirements', 'what_to_bring',
+    ]
+    WEEKDAY_CHOICES = [
+        (0, 'Bazar ertəsi'),
+        (1, 'Çərşənbə axşamı'),
+        (2, 'Çərşənbə'),
+        (3, 'Cümə axşamı'),
+        (4, 'Cümə'),
+        (5, 'Şənbə'),
+        (6, 'Bazar'),
+    ]
+    
+    title = models.CharField(max_length=200, verbose_name='Başlıq')
+    description = models.TextField(verbose_name='Təsvir')
+    category = models.ForeignKey('EventCategory', on_delete=models.CASCADE, related_name='series', verbose_name='Kateqoriya')
+    image = models.ImageField(upload_to='events/', verbose_name='Şəkil')
+    duration = models.IntegerField(help_text='Dəqiqə ilə', verbose_name='Müddət')
+    location = models.CharField(max_length=200, verbose_name='Yer')
+    age_group = models.CharField(max_length=10, choices=Event.AGE_GROUP_CHOICES, verbose_name='Yaş qrupu')
+    max_participants = models.IntegerField(verbose_name='Maksimum iştirakçı sayı')
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='Qiymət')
+    requirements = models.TextField(blank=True, verbose_name='Tələblər')
+    what_to_bring = models.TextField(blank=True, verbose_name='Nə gətirmək lazımdır')
+    
+    # Təkrarlanma qaydası
+    weekdays = models.CharField(max_length=20, verbose_name='Həftənin günləri',
+                                help_text='Vergüllə: 0=Bazar ertəsi ... 6=Bazar, məsələn "1,3"')
+    interval_weeks = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)],
+                                                      verbose_name='Hər neçə həftədən bir')
+    start_time = models.TimeField(verbose_name='Başlama saatı')
+    starts_on = models.DateField(verbose_name='Başlama tarixi')
+    ends_on = models.DateField(blank=True, null=True, verbose_name='Bitmə tarixi')
+    window_weeks = models.PositiveSmallIntegerField(default=8, verbose_name='Neçə həftə əvvəlcədən yaradılsın')
+    is_active = models.BooleanField(default=True, verbose_name='Aktiv')
+    generated_until = models.DateField(blank=True, null=True, editable=False, verbose_name='Yaradılıb (tarixədək)')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Tədbir Seriyası'
+        verbose_name_plural = 'Tədbir Seriyaları'
+        ordering = ['title']
+        constraints = [
+            # occurrences() interval_weeks-ə bölür
+            models.CheckConstraint(condition=Q(interval_weeks__gte=1), name='events_series_interval_gte_1'),
+        ]
+    
+    def __str__(self):
+        return self.title
+    
+    @property
+    def weekday_list(self):
+        return sorted({int(day) for day in self.weekdays.split(',') if day.strip().isdigit() and int(day) < 7})
+    
+    def occurrences(self, first_day, last_day):
+        """[first_day, last_day] aralığındakı başlama vaxtları (TIME_ZONE üzrə aware)"""
+        tz = timezone.get_default_timezone()
+        weekdays = set(self.weekday_list)
+        week_zero = self.starts_on - timedelta(days=self.starts_on.weekday())
+        day = max(first_day, self.starts_on)
+        if self.ends_on:
+            last_day = min(last_day, self.ends_on)
+        while day <= last_day:
+            week_index = (day - week_zero).days // 7
+            if day.weekday() in weekdays and week_index % self.interval_weeks == 0:
+                yield timezone.make_aware(datetime.combine(day, self.start_time), tz)
+            day += timedelta(days=1)
+    
+    def template_values(self):
+        return {field: getattr(self, field) for field in self.TEMPLATE_FIELDS}
+    
+    def materialize(self, today=None):
+        """Pəncərədəki hələ yaradılmamış tədbirləri bir bulk_create ilə yarat; yalnız yeniləri qaytarır"""
+        if not self.is_active:
+            return []
+        today = today or timezone.localdate()
+        first_day = today
+        if self.generated_until and self.generated_until >= today:
+            first_day = self.generated_until + timedelta(days=1)
+        last_day = today + timedelta(weeks=self.window_weeks)
+        
+        values = self.template_values()
+        length = timedelta(minutes=self.duration)
+        events = [
+            Event(series=self, date=start, ends_at=start + length, **values)
+            for start in self.occurrences(first_day, last_day)
+        ]
+        with transaction.atomic():
+            existing = set(
+                Event.objects.filter(series=self, date__in=[event.date for event in events])
+                .values_list('date', flat=True)
+            )
+            events = [event for event in events if event.date not in existing]
+            # (series, date) unikaldır - paralel işə salınma da dublikat yaratmır
+            Event.objects.bulk_create(events, ignore_conflicts=True)
+            EventSeries.objects.filter(pk=self.pk).update(generated_until=last_day)
+        self.generated_until = last_day
+        return events
+    
+    def future_events(self):
+        return Event.objects.filter(series=self, status='upcoming', date__gte=timezone.now())
+    
+    def sync_future_events(self, schedule_changed=False):
+        """Seriyanın dəyişikliklərini gələcək tədbirlərə bir UPDATE ilə yay.
+        
+        Cədvəl dəyişibsə, rezervasiyası olmayan gələcək tədbirlər silinir və
+        yeni qaydaya görə yenidən yaradılır.
+        """
+        with transaction.atomic():
+            updated = self.future_events().update(
+                ends_at=F('date') + timedelta(minutes=self.duration),
+                updated_at=timezone.now(),
+                **self.template_values()
+            )
+            if schedule_changed:
+                self.future_events().filter(confirmed_count=0, bookings__isnull=True).delete()
+                EventSeries.objects.filter(pk=self.pk).update(generated_until=None)
+                self.generated_until = None
+        if schedule_changed:
+            self.materialize()
+        return updated
 
 
 class Booking(models.Model):
@@ -87,6 +314,9 @@ class Booking(models.Model):
         ('completed', 'Tamamlandı'),
     ]
     
+    # Event.confirmed_count-da yer tutan statuslar
+    SEAT_STATUSES = ('confirmed',)
+    
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='bookings', verbose_name='Tədbir')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookings', verbose_name='İstifadəçi')
     child = models.ForeignKey(Child, on_delete=models.CASCADE, related_name='bookings', verbose_name='Uşaq')
@@ -104,6 +334,52 @@ class Booking(models.Model):
     def __str__(self):
         return f"{self.child.name} - {self.event.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._saved_state = (loaded.get('event_id'), loaded.get('status'))
+        return instance
+    
+    def _seat_delta(self):
+        """Saxlanılmış vəziyyətə görə sayğac dəyişiklikləri: {event_id: delta}"""
+        deltas = {}
+        saved_state = getattr(self, '_saved_state', None)
+        if self._state.adding:
+            saved_state = (None, None)
+        elif saved_state is None or None in saved_state:
+            saved_state = tuple(
+                Booking.objects.filter(pk=self.pk).values_list('event_id', 'status').first() or (None, None)
+            )
+        old_event_id, old_status = saved_state
+        if old_event_id and old_status in self.SEAT_STATUSES:
+            deltas[old_event_id] = deltas.get(old_event_id, 0) - 1
+        if self.status in self.SEAT_STATUSES:
+            deltas[self.event_id] = deltas.get(self.event_id, 0) + 1
+        return deltas
+    
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            deltas = self._seat_delta()
+            super().save(*args, **kwargs)
+            for event_id, delta in deltas.items():
+                Event.adjust_confirmed_count(event_id, delta)
+                if delta < 0:
+                    Event.on_seats_freed(event_id)
+            if deltas.get(self.event_id, 0) < 0:
+                from .tickets import expires_at, revoke_bookings
+                expires = expires_at(self.event)
+                transaction.on_commit(lambda: revoke_bookings([self.pk], expires))
+        self._saved_state = (self.event_id, self.status)
+    
+    @property
+    def ticket_token(self):
+        """QR bilet üçün imzalı token (yalnız təsdiqlənmiş rezervasiyalar)"""
+        if self.status != 'confirmed':
+            return None
+        from .tickets import make_token
+        return make_token(self)
+    
     @property
     def can_cancel(self):
         from django.utils import timezone
@@ -126,3 +402,54 @@ class EventReview(models.Model):
     
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.event.title} ({self.rating}/5)"
+
+
+class EventRatingSummary(RatingSummary):
+    """Tədbir rəylərinin xülasəsi"""
+    target_field = 'event'
+    
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name='rating_summary', verbose_name='Tədbir')
+    
+    class Meta:
+        verbose_name = 'Tədbir Reytinqi'
+        verbose_name_plural = 'Tədbir Reytinqləri'
+    
+    def __str__(self):
+        return f"{self.event.title} ({self.count})"
+
+
+class WaitlistEntry(models.Model):
+    """Gözləmə siyahısı"""
+    STATUS_CHOICES = [
+        ('waiting', 'Gözləyir'),
+        ('promoted', 'Rezervasiya edildi'),
+        ('cancelled', 'Ləğv edildi'),
+    ]
+    
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='waitlist', verbose_name='Tədbir')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='waitlist_entries', verbose_name='İstifadəçi')
+    child = models.ForeignKey(Child, on_delete=models.CASCADE, related_name='waitlist_entries', verbose_name='Uşaq')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='waiting', verbose_name='Status')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Qoşulma tarixi')
+    promoted_at = models.DateTimeField(blank=True, null=True, verbose_name='Rezervasiya tarixi')
+    
+    class Meta:
+        verbose_name = 'Gözləmə Siyahısı'
+        verbose_name_plural = 'Gözləmə Siyahıları'
+        unique_together = ['event', 'child']
+        ordering = ['id']
+        indexes = [
+            # Növbənin başı: WHERE event_id = ? AND status = 'waiting' ORDER BY id LIMIT n
+            models.Index(fields=['event', 'status', 'id'], name='events_waitlist_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.child.name} - {self.event.title} ({self.get_status_display()})"
+    
+    @property
+    def position(self):
+        if self.status != 'waiting':
+            return None
+        if hasattr(self, 'queue_position'):
+            return self.queue_position
+        return WaitlistEntry.objects.filter(event_id=self.event_id, status='waiting', id__lte=self.id).count()
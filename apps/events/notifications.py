@@ -0,0 +1,54 @@
+"""Tədbir ləğvi bildirişləri: fon axınında, paketlərlə göndərilir"""
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+
+def _send_cancellation_notices(event_title, event_date, user_ids):
+    subject = f'Alisa Club - "{event_title}" tədbiri ləğv edildi'
+    body = (
+        f'Hörmətli valideyn,\n\n'
+        f'{event_date:%d.%m.%Y %H:%M} tarixində keçiriləcək "{event_title}" tədbiri ləğv edildi. '
+        f'Rezervasiyanız avtomatik ləğv olunub.\n\nAlisa Club'
+    )
+    try:
+        for start in range(0, len(user_ids), BATCH_SIZE):
+            recipients = (
+                User.objects.filter(pk__in=user_ids[start:start + BATCH_SIZE])
+                .exclude(email='')
+                .values_list('email', flat=True)
+            )
+            messages = [
+                EmailMessage(subject, body, settings.EMAIL_HOST_USER, [email])
+                for email in recipients
+            ]
+            if messages:
+                # Paket başına bir SMTP bağlantısı
+                get_connection(fail_silently=True).send_messages(messages)
+    except Exception:
+        logger.exception('Ləğv bildirişləri göndərilmədi: %s', event_title)
+    finally:
+        connections.close_all()
+
+
+def queue_cancellation_notices(event, user_ids):
+    """Bildirişləri sorğunu gözlətmədən fon axınında göndər"""
+    if not user_ids:
+        return None
+    thread = threading.Thread(
+        target=_send_cancellation_notices,
+        args=(event.title, event.date, list(user_ids)),
+        name=f'event-{event.pk}-cancel-notices',
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,31 @@
+"""Tədbir statuslarının avtomatik dəyişməsi: upcoming -> ongoing -> completed.
+
+Hər keçid (status, date) və (status, ends_at) indeksləri üzərində bir
+UPDATE-dir. İşə salmaq üçün: advance_event_statuses əmri - cron və ya
+--interval ilə tək fon prosesi (hər veb worker-də deyil). İş işləməsə də
+siyahılar keçmiş tədbirləri göstərmir: Event.objects.upcoming() tarixi də
+yoxlayır.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from apps.membership import feed
+
+from .models import Event
+
+
+def advance_event_statuses(now=None):
+    """Vaxtı çatmış tədbirləri toplu şəkildə keçir; (başlayan, bitən) sayını qaytarır"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        completed = Event.objects.filter(
+            status__in=['upcoming', 'ongoing'], ends_at__lte=now
+        ).update(status='completed', updated_at=now)
+        started = Event.objects.filter(
+            status='upcoming', date__lte=now
+        ).update(status='ongoing', updated_at=now)
+        if started or completed:
+            # update() siqnal göndərmir - keçən tədbirlər lentlərdən çıxsın
+            transaction.on_commit(feed.bump_catalog)
+    return started, completed
+
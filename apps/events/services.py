@@ -0,0 +1,281 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.membership import feed
+
+from .holds import HoldStoreBusy, get_hold_store, holder_key
+from .live import publish
+from .models import Event, Booking, WaitlistEntry
+from .notifications import queue_cancellation_notices
+from .tickets import expires_at, revoke_bookings, revoke_event
+
+
+BOOKED = 'booked'
+FULL = 'full'
+DUPLICATE = 'duplicate'
+CLOSED = 'closed'
+WAITLISTED = 'waitlisted'
+OPEN = 'open'
+
+CHECK_IN_STATUSES = ('confirmed', 'completed')
+
+
+def feeds_changed(user_ids):
+    """Rezervasiyalar bulk_create/update() ilə yazılır (siqnal yoxdur) - uşaq lentlərini commit-dən sonra köhnəlt"""
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: [feed.bump_user(user_id) for user_id in user_ids])
+
+
+@dataclass
+class BookingResult:
+    status: str
+    booking: Optional[Booking] = None
+    bookings: List[Booking] = field(default_factory=list)
+    
+    @property
+    def ok(self):
+        return self.status == BOOKED
+
+
+def book_seat(event, user, child, notes=''):
+    """Bir uşaq üçün rezervasiya - book_seats-in qısa forması"""
+    return book_seats(event, user, [child], notes=notes)
+
+
+class _AlreadyBooked(Exception):
+    pass
+
+
+def book_seats(event, user, children, notes=''):
+    """Bir və ya bir neçə uşaq üçün yer tut - hamısı və ya heç biri.
+    
+    Bütün yerlər Event.reserve_seats ilə bir şərti UPDATE-də tutulur (bu həm
+    də tədbir sətrini kilidləyir), sonra mövcud rezervasiyalar bir sorğu ilə
+    yoxlanılır və yeni sətirlər bir bulk_create ilə yazılır. Uşaqlardan biri
+    artıq rezervasiya olunubsa, bütün tranzaksiya geri qaytarılır. Əvvəl ləğv
+    edilmiş rezervasiyalar yenidən aktivləşdirilir. İstifadəçinin öz
+    saxlaması (holds) yer kimi istifadə olunur, başqalarınınkı isə boş sayılmır.
+    """
+    if event.date < timezone.now() or event.status != 'upcoming':
+        return BookingResult(CLOSED)
+    
+    children = list(children)
+    child_ids = [child.pk for child in children]
+    store = get_hold_store()
+    holder = holder_key(user)
+    try:
+        with transaction.atomic():
+            if not Event.reserve_seats(event.pk, len(children), held=store.held(event.pk, exclude=holder)):
+                return BookingResult(FULL)
+            
+            existing = dict(
+                Booking.objects.filter(event=event, child_id__in=child_ids).values_list('child_id', 'status')
+            )
+            if any(status != 'cancelled' for status in existing.values()):
+                raise _AlreadyBooked
+            if existing:
+                Booking.objects.filter(event=event, child_id__in=existing).update(
+                    status='confirmed', user=user, notes=notes
+                )
+            Booking.objects.bulk_create([
+                Booking(event=event, user=user, child=child, notes=notes, status='confirmed')
+                for child in children if child.pk not in existing
+            ])
+            feeds_changed([user.pk])
+    except (_AlreadyBooked, IntegrityError):
+        return BookingResult(DUPLICATE)
+    
+    try:
+        store.release(event.pk, holder)
+    except HoldStoreBusy:
+        pass  # saxlama TTL bitəndə öz-özünə düşür
+    publish(event.pk)
+    bookings = list(Booking.objects.filter(event=event, child_id__in=child_ids).select_related('child'))
+    return BookingResult(BOOKED, bookings[0], bookings)
+
+
+def hold_seat(event, user, seats=1):
+    """Rezervasiya formu açılanda yer saxla (TTL bitənə və ya rezervasiyaya çevrilənə qədər).
+    
+    Saxlama kilidi alınmasa HoldStoreBusy qalxır - bu "yer yoxdur" demək deyil.
+    """
+    capacity = event.max_participants - event.confirmed_count
+    acquired = get_hold_store().acquire(event.pk, holder_key(user), capacity, seats=seats)
+    if acquired:
+        publish(event.pk)
+    return acquired
+
+
+def join_waitlist(event, user, child):
+    """Dolu tədbirin gözləmə siyahısına qoşul.
+    
+    Yer boşdursa OPEN qaytarılır - istifadəçi adi rezervasiyaya yönləndirilir.
+    """
+    if event.date < timezone.now() or event.status != 'upcoming':
+        return BookingResult(CLOSED)
+    if not event.is_full:
+        return BookingResult(OPEN)
+    if Booking.objects.filter(event=event, child=child, status__in=Booking.SEAT_STATUSES).exists():
+        return BookingResult(DUPLICATE)
+    
+    try:
+        with transaction.atomic():
+            WaitlistEntry.objects.create(event=event, user=user, child=child)
+    except IntegrityError:
+        rejoined = WaitlistEntry.objects.filter(
+            event=event, child=child, status='cancelled'
+        ).update(status='waiting', user=user, promoted_at=None)
+        if not rejoined:
+            return BookingResult(DUPLICATE)
+    
+    # Yoxlama ilə qoşulma arasında yer boşalıbsa, dərhal ver
+    promote_waitlist(event.pk)
+    return BookingResult(WAITLISTED)
+
+
+def promote_waitlist(event_id):
+    """Boş yerləri növbənin başındakılara ver və yaradılan rezervasiyaları qaytar.
+    
+    İlk addım şərti yazıdır (Event.reserve_seats): o, tədbir sətrini (SQLite-da
+    bütün bazanı) kilidləyir, buna görə eyni tədbir üçün paralel çağırışlar
+    ardıcıl işləyir və eyni qeydi iki dəfə irəli çəkə bilməz. Sonrakı
+    sorğular indeksli növbənin yalnız ilk N sətrini oxuyur - iş həcmi
+    boşalan yerlərin sayına mütənasibdir, növbənin uzunluğuna yox.
+    
+    Ləğv edilmiş və ya keçmiş tədbir üçün heç kim irəli çəkilmir.
+    """
+    held = get_hold_store().held(event_id)
+    with transaction.atomic():
+        if not Event.reserve_seats(event_id, held=held):
+            return []
+        
+        max_participants, confirmed_count, status, date = Event.objects.filter(pk=event_id).values_list(
+            'max_participants', 'confirmed_count', 'status', 'date'
+        ).get()
+        if status != 'upcoming' or date < timezone.now():
+            Event.adjust_confirmed_count(event_id, -1)
+            return []
+        free = 1 + max(max_participants - confirmed_count - held, 0)
+        
+        # Eyni uşağın bu tədbirdə yer tutan rezervasiyası varsa, qeyd ötürülür
+        seated = Booking.objects.filter(
+            event_id=event_id, child_id=OuterRef('child_id'), status__in=Booking.SEAT_STATUSES
+        )
+        entries = list(
+            WaitlistEntry.objects.filter(event_id=event_id, status='waiting')
+            .exclude(Exists(seated))
+            .order_by('id')[:free]
+        )
+        if not entries:
+            Event.adjust_confirmed_count(event_id, -1)
+            return []
+        if len(entries) > 1:
+            # Kilid altında oxunub - bu yerlər hələ də boşdur
+            Event.reserve_seats(event_id, len(entries) - 1, held=held)
+        
+        child_ids = [entry.child_id for entry in entries]
+        existing = set(
+            Booking.objects.filter(event_id=event_id, child_id__in=child_ids).values_list('child_id', flat=True)
+        )
+        if existing:
+            Booking.objects.filter(event_id=event_id, child_id__in=existing).update(status='confirmed')
+        Booking.objects.bulk_create([
+            Booking(
+                event_id=event_id,
+                user_id=entry.user_id,
+                child_id=entry.child_id,
+                status='confirmed',
+                notes='Gözləmə siyahısından',
+            )
+            for entry in entries if entry.child_id not in existing
+        ])
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            status='promoted', promoted_at=timezone.now()
+        )
+        feeds_changed(entry.user_id for entry in entries)
+    
+    return list(Booking.objects.filter(event_id=event_id, child_id__in=child_ids).select_related('child', 'user'))
+
+
+def cancel_bookings(bookings):
+    """Rezervasiyaları toplu ləğv et, sayğacları bir dəfəyə düzəlt və yerləri növbəyə ver.
+    
+    bookings - Booking queryset-i (məsələn, admin action-dan). Qaytarır:
+    ləğv edilən rezervasiya sayı.
+    """
+    with transaction.atomic():
+        revoked = list(bookings.filter(status='confirmed').select_related('event').only(
+            'pk', 'event__date', 'event__duration'
+        ))
+        freed = dict(
+            bookings.filter(status__in=Booking.SEAT_STATUSES)
+            .order_by()
+            .values('event_id')
+            .annotate(total=Count('pk'))
+            .values_list('event_id', 'total')
+        )
+        active = bookings.filter(status__in=['pending', 'confirmed'])
+        feeds_changed(active.order_by().values_list('user_id', flat=True).distinct())
+        cancelled = active.update(status='cancelled')
+        for event_id, total in freed.items():
+            Event.adjust_confirmed_count(event_id, -total)
+            Event.on_seats_freed(event_id)
+        if revoked:
+            transaction.on_commit(lambda: revoke_bookings(
+                [booking.pk for booking in revoked],
+                max(expires_at(booking.event) for booking in revoked),
+            ))
+    return cancelled
+
+
+def check_in(event_id, booking_ids=(), child_ids=()):
+    """Qapıda toplu qeydiyyat: rezervasiyaları iştirak etdi kimi işarələ.
+    
+    Bir UPDATE ilə yazılır; artıq işarələnmiş sətirlər filtrdən keçmir, buna
+    görə eyni paketi təkrar göndərmək zərərsizdir. Qaytarır:
+    (yeni işarələnənlər, tədbirdə ümumi iştirakçı sayı).
+    """
+    ids = Q(pk__in=booking_ids) | Q(child_id__in=child_ids)
+    with transaction.atomic():
+        updated = Booking.objects.filter(
+            ids, event_id=event_id, status__in=CHECK_IN_STATUSES, attended=False
+        ).update(attended=True)
+        headcount = Booking.objects.filter(event_id=event_id, attended=True).count()
+    return updated, headcount
+
+
+def cancel_event(event):
+    """Tədbiri ləğv et və bütün asılılıqları toplu şəkildə bağla.
+    
+    Aktiv rezervasiyalar və gözləmə siyahısı bir UPDATE ilə ləğv olunur,
+    sətirlər yaddaşa yüklənmir - bildiriş üçün yalnız fərqli istifadəçi
+    id-ləri oxunur. Biletlər, saxlamalar və bildirişlər commit-dən sonra
+    işlənir. Qaytarır: ləğv edilən rezervasiya sayı.
+    """
+    active = Booking.objects.filter(event_id=event.pk, status__in=['pending', 'confirmed'])
+    with transaction.atomic():
+        Event.objects.filter(pk=event.pk).update(status='cancelled', confirmed_count=0, updated_at=timezone.now())
+        user_ids = list(active.order_by().values_list('user_id', flat=True).distinct())
+        cancelled = active.update(status='cancelled')
+        WaitlistEntry.objects.filter(event_id=event.pk, status='waiting').update(status='cancelled')
+        
+        def after_commit():
+            revoke_event(event)
+            try:
+                get_hold_store().clear(event.pk)
+            except HoldStoreBusy:
+                pass  # ləğv edilmiş tədbirə yeni saxlama verilmir, qalanlar TTL ilə düşür
+            publish(event.pk)
+            # Status update() ilə dəyişir - lentlərdən çıxması üçün kataloq versiyası
+            feed.bump_catalog()
+            queue_cancellation_notices(event, user_ids)
+        
+        transaction.on_commit(after_commit)
+    
+    event.status = 'cancelled'
+    event.confirmed_count = 0
+    return cancelled
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from apps.core.ratings import track_ratings
+from .models import Event, Booking, EventReview, EventRatingSummary
+
+
+@receiver(post_delete, sender=Booking)
+def release_seat_on_delete(sender, instance, **kwargs):
+    """Silinən təsdiqlənmiş rezervasiyanın yerini sayğacdan çıx (kaskad silinmələr daxil)"""
+    if instance.status in Booking.SEAT_STATUSES:
+        Event.adjust_confirmed_count(instance.event_id, -1)
+        Event.on_seats_freed(instance.event_id)
+
+
+track_ratings(EventReview, EventRatingSummary)
@@ -0,0 +1,149 @@
+"""Təsdiqlənmiş rezervasiyalar üçün imzalı QR biletlər.
+
+Bilet `rezervasiya.tədbir.bitmə` (base62) və HMAC imzasından ibarətdir, buna
+görə qapıdakı skaner onu Booking/Child/Event cədvəllərinə baxmadan
+yoxlayır. Ləğv edilmiş biletlər cache-də qeyd olunur: qeydlər ləğvin
+tranzaksiyası commit olanda yazılır və bilet etibarlı olduğu müddətcə
+saxlanılır. Bunun üçün cache bütün işçilər arasında paylaşılmalıdır
+(REDIS_URL, events.W001). İştirak qeydləri yaddaşda toplanıb bir UPDATE
+ilə yazılır.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+
+SALT = 'events.ticket'
+GRACE = timedelta(hours=2)
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidTicket(Exception):
+    pass
+
+
+class ExpiredTicket(InvalidTicket):
+    pass
+
+
+def _signer():
+    return signing.Signer(salt=SALT)
+
+
+def expires_at(event):
+    """Tədbirin biletlərinin etibarlılıq sonu"""
+    return event.date + timedelta(minutes=event.duration) + GRACE
+
+
+def make_token(booking):
+    expires = expires_at(booking.event)
+    payload = '.'.join(signing.b62_encode(value) for value in (booking.pk, booking.event_id, int(expires.timestamp())))
+    return _signer().sign(payload)
+
+
+def verify_token(token, now=None):
+    """İmzanı, müddəti və ləğv qeydlərini yoxla; (booking_id, event_id) qaytarır"""
+    try:
+        payload = _signer().unsign(token.strip())
+        booking_id, event_id, expires = (signing.b62_decode(part) for part in payload.split('.'))
+    except (signing.BadSignature, ValueError):
+        raise InvalidTicket('Bilet etibarsızdır.')
+    if (now or time.time()) > expires:
+        raise ExpiredTicket('Biletin müddəti bitib.')
+    if cache.get_many([_revoked_key('b', booking_id), _revoked_key('e', event_id)]):
+        raise InvalidTicket('Bilet ləğv edilib.')
+    return booking_id, event_id
+
+
+def _revoked_key(kind, pk):
+    return f'events:ticket:revoked:{kind}:{pk}'
+
+
+def _revoked_timeout(expires):
+    """Ləğv qeydi biletdən əvvəl düşməməlidir"""
+    return max(int(expires.timestamp() - time.time()), 0) + 60
+
+
+def revoke_bookings(booking_ids, expires):
+    """expires - bu rezervasiyaların biletlərinin ən gec etibarlılıq sonu"""
+    if booking_ids:
+        cache.set_many({_revoked_key('b', pk): 1 for pk in booking_ids}, timeout=_revoked_timeout(expires))
+
+
+def revoke_event(event):
+    cache.set(_revoked_key('e', event.pk), 1, timeout=_revoked_timeout(expires_at(event)))
+
+
+class AttendanceBuffer:
+    """Skan edilmiş biletləri toplayıb tədbir başına bir UPDATE ilə yaz.
+    
+    max_size dolduqda və ya interval saniyə keçdikdə (fon taymeri ilə) yazılır;
+    proses dayananda qalanlar da yazılır. Yazıla bilməyən qeydlər növbəyə
+    qaytarılır.
+    """
+    
+    MAX_SEEN = 100_000
+    
+    def __init__(self, max_size=50, interval=2.0):
+        self.max_size = max_size
+        self.interval = interval
+        self._pending = defaultdict(set)
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._timer = None
+    
+    def add(self, event_id, booking_id):
+        """Qeydi növbəyə qoy; bu prosesdə artıq skan edilibsə False"""
+        with self._lock:
+            if booking_id in self._seen:
+                return False
+            if len(self._seen) >= self.MAX_SEEN:
+                self._seen.clear()
+            self._seen.add(booking_id)
+            self._pending[event_id].add(booking_id)
+            size = sum(len(ids) for ids in self._pending.values())
+            if size < self.max_size and self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if size >= self.max_size:
+            self.flush()
+        return True
+    
+    def _flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+    
+    def flush(self):
+        from .services import check_in
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(set)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        written = 0
+        for event_id, booking_ids in pending.items():
+            try:
+                check_in(event_id, booking_ids=list(booking_ids))
+            except DatabaseError:
+                # Baza məşğuldur - növbəti dəfə yenidən cəhd edilir
+                logger.exception('İştirak qeydləri yazıla bilmədi: tədbir %s', event_id)
+                with self._lock:
+                    self._pending[event_id] |= booking_ids
+            else:
+                written += len(booking_ids)
+        return written
+
+
+attendance_buffer = AttendanceBuffer()
+atexit.register(attendance_buffer.flush)
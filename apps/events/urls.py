@@ -8,8 +8,15 @@ urlpatterns = [
     path('preview/', views.event_list_preview, name='event_list_preview'),
     path('<int:pk>/', views.event_detail, name='event_detail'),
     path('<int:pk>/book/', views.book_event, name='book_event'),
+    path('<int:pk>/queue/', views.queue_wait, name='queue_wait'),
+    path('<int:pk>/queue/status/', views.queue_status, name='queue_status'),
+    path('<int:pk>/waitlist/', views.join_waitlist, name='join_waitlist'),
+    path('seats/stream/', views.seat_stream, name='seat_stream'),
+    path('waitlist/<int:entry_id>/leave/', views.leave_waitlist, name='leave_waitlist'),
     path('booking/<int:booking_id>/success/', views.booking_success, name='booking_success'),
     path('booking/<int:booking_id>/cancel/', views.cancel_booking, name='cancel_booking'),
+    path('<int:pk>/check-in/', views.check_in, name='check_in'),
+    path('<int:pk>/scan/', views.scan_ticket, name='scan_ticket'),
     path('<int:pk>/review/', views.add_review, name='add_review'),
     path('my-bookings/', views.my_bookings, name='my_bookings'),
 ]
\ No newline at end of file
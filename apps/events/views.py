@@ -1,29 +1,34 @@
+import hmac
+import json
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Avg
+from django.db.models import Q
 from django.utils import timezone
-from .models import Event, EventCategory, Booking, EventReview
-from .forms import BookingForm, EventReviewForm, EventFilterForm
+from .models import Event, Booking, EventReview, WaitlistEntry
+from .forms import BookingForm, EventReviewForm, EventFilterForm, WaitlistForm
+from .holds import HoldStoreBusy, hold_ttl
+from apps.core import refdata
+from . import admission, live, services, tickets
+from .loaders import load_event_page
 
 
 def event_list(request):
     """Tədbir siyahısı"""
-    events = Event.objects.filter(status='upcoming', date__gte=timezone.now())
-    categories = EventCategory.objects.all()
+    events = Event.objects.with_capacity().upcoming()
+    categories = refdata.event_categories.all()
     
     # Filtrlər
     form = EventFilterForm(request.GET)
     if form.is_valid():
-        if form.cleaned_data['category']:
-            events = events.filter(category_id=form.cleaned_data['category'])
-        if form.cleaned_data['age_group']:
-            events = events.filter(age_group=form.cleaned_data['age_group'])
-        if form.cleaned_data['date_from']:
-            events = events.filter(date__date__gte=form.cleaned_data['date_from'])
-        if form.cleaned_data['date_to']:
-            events = events.filter(date__date__lte=form.cleaned_data['date_to'])
+        events = form.filter_queryset(events)
     
     # Axtarış
     search = request.GET.get('search')
@@ -42,50 +47,38 @@ def event_list(request):
         'page_obj': page_obj,
         'categories': categories,
         'form': form,
-        'search': search
+        'search': search,
+        'live_seats': live.is_available(request)
     })
 
 def event_list_preview(request):
     """Ən son 3 gələcək tədbiri göstərən önizləmə"""
-    events = Event.objects.filter(status='upcoming', date__gte=timezone.now())[:3]
+    events = Event.objects.with_capacity().upcoming()[:3]
     return render(request, 'events/event_list_preview.html', {
         'events': events
     })
 
 def event_detail(request, pk):
     """Tədbir detalları"""
-    event = get_object_or_404(Event, pk=pk)
-    reviews = event.reviews.all()[:5]
-    avg_rating = reviews.aggregate(Avg('rating'))['rating__avg']
-    
-    user_booking = None
-    user_review = None
-    can_review = False
-    
-    if request.user.is_authenticated:
-        user_booking = Booking.objects.filter(
-            event=event, 
-            user=request.user
-        ).first()
-        
-        user_review = EventReview.objects.filter(
-            event=event,
-            user=request.user
-        ).first()
-        
-        # Rəy yaza bilər əgər tədbirə qatılıbsa və hələ rəy yazmaıbsa
-        can_review = (user_booking and 
-                     user_booking.attended and 
-                     not user_review and
-                     event.date < timezone.now())
+    page = load_event_page(pk, request.user)
+    event = page.event
+    rating_summary = page.rating_summary
+    
+    waitlist_form = None
+    if request.user.is_authenticated and event.is_full:
+        waitlist_form = WaitlistForm(user=request.user)
     
     return render(request, 'events/event_detail.html', {
         'event': event,
-        'reviews': reviews,
-        'avg_rating': avg_rating,
-        'user_booking': user_booking,
-        'user_review': user_review,
-        'can_review': can_review
+        'reviews': page.reviews,
+        'avg_rating': rating_summary.average if rating_summary else None,
+        'rating_summary': rating_summary,
+        'user_booking': page.user_booking,
+        'user_review': page.user_review,
+        'can_review': page.can_review,
+        'waitlist_entries': page.waitlist_entries,
+        'waitlist_form': waitlist_form,
+        'live_seats': live.is_available(request)
     })
 
 @login_required
@@ -93,11 +86,28 @@ def book_event(request, pk):
     """Tədbir rezervasiyası"""
     event = get_object_or_404(Event, pk=pk)
     
-    # Yoxlamalar
-    if event.is_full:
-        messages.error(request, 'Bu tədbir üçün yer qalmayıb.')
-        return redirect('events:event_detail', pk=pk)
+    # Növbə rejimi: yalnız növbəsi çatmış biletlə
+    if event.queue_mode:
+        ticket = admission.read_ticket(request.COOKIES.get(admission.cookie_name(pk)), pk)
+        if ticket is None or ticket['u'] != request.user.pk:
+            try:
+                issued = admission.issue_ticket(event, request.user)
+            except admission.QueueBusy:
+                messages.error(request, 'Hazırda sorğular çoxdur. Bir az sonra yenidən cəhd edin.')
+                return redirect('events:event_detail', pk=pk)
+            response = redirect('events:queue_wait', pk=pk)
+            response.set_cookie(
+                admission.cookie_name(pk),
+                issued,
+                max_age=admission.TICKET_MAX_AGE,
+                httponly=True,
+                samesite='Lax',
+            )
+            return response
+        if not admission.status(ticket)['admitted']:
+            return redirect('events:queue_wait', pk=pk)
     
+    # Yoxlamalar
     if event.date < timezone.now():
         messages.error(request, 'Bu tədbir artıq keçmişdə qalıb.')
         return redirect('events:event_detail', pk=pk)
@@ -115,36 +125,136 @@ def book_event(request, pk):
     if request.method == 'POST':
         form = BookingForm(request.POST, user=request.user)
         if form.is_valid():
-            # Eyni uşaq üçün rezervasiya var mı?
-            existing_booking = Booking.objects.filter(
-                event=event,
-                child=form.cleaned_data['child']
-            ).first()
+            result = services.book_seats(
+                event,
+                request.user,
+                form.cleaned_data['children'],
+                notes=form.cleaned_data['notes'],
+            )
             
-            if existing_booking:
-                messages.error(request, 'Bu uşaq üçün artıq rezervasiya mövcuddur.')
-            else:
-                booking = form.save(commit=False)
-                booking.event = event
-                booking.user = request.user
-                booking.status = 'confirmed'
-                booking.save()
-                
+            if result.ok:
                 messages.success(request, 'Rezervasiya uğurla tamamlandı!')
-                return redirect('events:booking_success', booking_id=booking.id)
+                return redirect('events:booking_success', booking_id=result.booking.id)
+            if result.status == services.FULL:
+                messages.error(request, 'Bu tədbir üçün yer qalmayıb. Gözləmə siyahısına yazıla bilərsiniz.')
+                return redirect('events:event_detail', pk=pk)
+            if result.status == services.DUPLICATE:
+                messages.error(request, 'Seçilmiş uşaqlardan biri üçün artıq rezervasiya mövcuddur.')
+            else:
+                messages.error(request, 'Bu tədbir üçün rezervasiya bağlıdır.')
+                return redirect('events:event_detail', pk=pk)
     else:
         form = BookingForm(user=request.user)
     
-    return render(request, 'events/book_event.html', {
+    response = render(request, 'events/book_event.html', {
         'event': event,
-        'form': form
+        'form': form,
+        'hold_minutes': hold_ttl() // 60,
     })
+    if request.method != 'POST':
+        # Form doldurularkən yeri müvəqqəti saxla - yalnız səhifə uğurla qurulduqdan sonra
+        try:
+            held = services.hold_seat(event, request.user)
+        except HoldStoreBusy:
+            messages.error(request, 'Hazırda sorğular çoxdur. Bir az sonra yenidən cəhd edin.')
+            return redirect('events:event_detail', pk=pk)
+        if not held:
+            messages.error(request, 'Bu tədbir üçün yer qalmayıb. Gözləmə siyahısına yazıla bilərsiniz.')
+            return redirect('events:event_detail', pk=pk)
+    return response
+
+@login_required
+def queue_wait(request, pk):
+    """Virtual növbə gözləmə səhifəsi"""
+    event = get_object_or_404(Event, pk=pk)
+    ticket = admission.read_ticket(request.COOKIES.get(admission.cookie_name(pk)), pk)
+    if not event.queue_mode or ticket is None:
+        return redirect('events:book_event', pk=pk)
+    
+    return render(request, 'events/queue_wait.html', {
+        'event': event,
+        'queue': admission.status(ticket),
+        'poll_interval': admission.POLL_INTERVAL
+    })
+
+def queue_status(request, pk):
+    """Növbə vəziyyəti (JSON). Yalnız imzalı cookie və cache oxunur - baza sorğusu yoxdur"""
+    ticket = admission.read_ticket(request.COOKIES.get(admission.cookie_name(pk)), pk)
+    if ticket is None:
+        return JsonResponse({'error': 'ticket'}, status=403)
+    
+    response = JsonResponse(admission.status(ticket))
+    response['Cache-Control'] = 'no-store'
+    return response
+
+async def seat_stream(request):
+    """Boş yer sayı üçün SSE axını: ?ids=1,2,3 (bir və ya bir neçə tədbir).
+    
+    ASGI-də bu URL adətən live.SeatStreamApp tərəfindən middleware-siz
+    cavablandırılır; view isə digər hallar üçündür. Bağlantılar hub-dakı
+    ortaq izləyiciyə abunə olur - bağlantı başına sorğu yoxdur. WSGI altında
+    uzun axın mümkün deyil: şablonlar skripti qoşmur, köhnə səhifələrə isə
+    204 qaytarılır - EventSource 204-dən sonra yenidən qoşulmur.
+    """
+    event_ids = live.parse_ids(request.GET.get('ids', ''))
+    if event_ids is None:
+        return JsonResponse({'error': 'ids'}, status=400)
+    
+    if not live.is_available(request):
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(live.stream(event_ids), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-store'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+def join_waitlist(request, pk):
+    """Gözləmə siyahısına yazıl"""
+    event = get_object_or_404(Event, pk=pk)
+    
+    if request.method != 'POST':
+        return redirect('events:event_detail', pk=pk)
+    
+    form = WaitlistForm(request.POST, user=request.user)
+    if not form.is_valid():
+        messages.error(request, 'Uşaq seçin.')
+        return redirect('events:event_detail', pk=pk)
+    
+    result = services.join_waitlist(event, request.user, form.cleaned_data['child'])
+    if result.status == services.WAITLISTED:
+        messages.success(request, 'Gözləmə siyahısına əlavə olundunuz. Yer boşalan kimi rezervasiya avtomatik ediləcək.')
+    elif result.status == services.OPEN:
+        return redirect('events:book_event', pk=pk)
+    elif result.status == services.DUPLICATE:
+        messages.error(request, 'Bu uşaq artıq rezervasiya və ya gözləmə siyahısındadır.')
+    else:
+        messages.error(request, 'Bu tədbir üçün rezervasiya bağlıdır.')
+    
+    return redirect('events:event_detail', pk=pk)
+
+@login_required
+def leave_waitlist(request, entry_id):
+    """Gözləmə siyahısından çıx"""
+    entry = get_object_or_404(WaitlistEntry, id=entry_id, user=request.user, status='waiting')
+    
+    if request.method == 'POST':
+        entry.status = 'cancelled'
+        entry.save(update_fields=['status'])
+        messages.success(request, 'Gözləmə siyahısından çıxdınız.')
+    
+    return redirect('events:event_detail', pk=entry.event_id)
 
 @login_required
 def booking_success(request, booking_id):
     """Rezervasiya uğur səhifəsi"""
-    booking = get_object_or_404(Booking, id=booking_id, user=request.user)
-    return render(request, 'events/booking_success.html', {'booking': booking})
+    booking = get_object_or_404(Booking.objects.select_related('event', 'child'), id=booking_id, user=request.user)
+    # Eyni anda rezervasiya edilmiş bacı-qardaşlar da göstərilir
+    bookings = Booking.objects.filter(
+        event_id=booking.event_id,
+        user=request.user,
+        status='confirmed'
+    ).select_related('event', 'child')
+    return render(request, 'events/booking_success.html', {'booking': booking, 'bookings': bookings})
 
 @login_required
 def cancel_booking(request, booking_id):
@@ -208,4 +318,65 @@ def my_bookings(request):
     
     return render(request, 'events/my_bookings.html', {
         'bookings': bookings
-    })
\ No newline at end of file
+    })
+
+def _id_list(values):
+    return [int(value) for value in values if str(value).isdigit()]
+
+@staff_member_required
+@require_POST
+def check_in(request, pk):
+    """Qapıda toplu qeydiyyat (işçilər üçün JSON API).
+    
+    Gövdə: {"booking_ids": [...]} və/və ya {"child_ids": [...]};
+    form-data ilə eyni adlı təkrarlanan sahələr də qəbul olunur.
+    """
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Yanlış JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'JSON obyekt olmalıdır'}, status=400)
+        booking_ids = payload.get('booking_ids') or []
+        child_ids = payload.get('child_ids') or []
+    else:
+        booking_ids = request.POST.getlist('booking_ids')
+        child_ids = request.POST.getlist('child_ids')
+    
+    if not isinstance(booking_ids, list) or not isinstance(child_ids, list):
+        return JsonResponse({'error': 'booking_ids və child_ids siyahı olmalıdır'}, status=400)
+    
+    get_object_or_404(Event.objects.only('pk'), pk=pk)
+    updated, headcount = services.check_in(pk, _id_list(booking_ids), _id_list(child_ids))
+    return JsonResponse({'checked_in': updated, 'headcount': headcount})
+
+def _is_scanner(request):
+    """Skaner cihazı X-Scanner-Key başlığı ilə tanınır - sessiya/istifadəçi sorğusu olmadan"""
+    key = getattr(settings, 'EVENT_SCANNER_KEY', '')
+    supplied = request.headers.get('X-Scanner-Key', '')
+    return bool(key) and hmac.compare_digest(key, supplied)
+
+@csrf_exempt
+@require_POST
+def scan_ticket(request, pk):
+    """QR bileti yoxla (baza sorğusu yoxdur) və iştirakı toplu yazılmaq üçün növbəyə qoy.
+    
+    CSRF yoxlaması yoxdur: skanerlər cookie göndərmir, sorğu isə imzalı bilet
+    olmadan heç nə dəyişmir.
+    """
+    if not _is_scanner(request):
+        # Açar yoxdursa, admin sessiyası ilə işləyən işçilər üçün
+        if not (request.user.is_active and request.user.is_staff):
+            return JsonResponse({'error': 'İcazə yoxdur'}, status=403)
+    
+    token = request.POST.get('token', '')
+    try:
+        booking_id, event_id = tickets.verify_token(token)
+    except tickets.InvalidTicket as exc:
+        return JsonResponse({'valid': False, 'error': str(exc)}, status=400)
+    if event_id != pk:
+        return JsonResponse({'valid': False, 'error': 'Bilet bu tədbir üçün deyil.'}, status=400)
+    
+    first_scan = tickets.attendance_buffer.add(event_id, booking_id)
+    return JsonResponse({'valid': True, 'booking_id': booking_id, 'first_scan': first_scan})
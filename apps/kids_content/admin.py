@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import ContentCategory, KidsMaterial, MaterialRating, Favorite, LearningProgress, MaterialDownload
+from .models import (
+    ContentCategory, KidsMaterial, MaterialRating, Favorite, LearningProgress, MaterialDownload, MaterialDailyStat,
+    MaterialNeighbour,
+)
 
 
 @admin.register(ContentCategory)
@@ -11,10 +14,10 @@ class ContentCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(KidsMaterial)
 class KidsMaterialAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'material_type', 'age_group', 'difficulty_level', 'is_premium', 'is_featured', 'view_count', 'download_count']
+    list_display = ['title', 'category', 'material_type', 'age_group', 'difficulty_level', 'is_premium', 'is_featured', 'view_count', 'download_count', 'popularity']
     list_filter = ['category', 'material_type', 'age_group', 'difficulty_level', 'is_premium', 'is_featured']
     search_fields = ['title', 'description']
-    readonly_fields = ['view_count', 'download_count', 'created_at', 'updated_at']
+    readonly_fields = ['view_count', 'download_count', 'popularity', 'created_at', 'updated_at']
     list_editable = ['is_featured', 'is_premium']
 
 
@@ -28,10 +31,37 @@ class MaterialRatingAdmin(admin.ModelAdmin):
 
 @admin.register(MaterialDownload)
 class MaterialDownloadAdmin(admin.ModelAdmin):
+    """Xam jurnal - yalnız son MATERIAL_DOWNLOAD_RETENTION_DAYS gün; statistika üçün MaterialDailyStat"""
     list_display = ['material', 'user', 'downloaded_at', 'ip_address']
-    list_filter = ['downloaded_at']
+    date_hierarchy = 'downloaded_at'
+    list_select_related = ['material', 'user']
     search_fields = ['material__title', 'user__username']
     readonly_fields = ['downloaded_at']
+    show_full_result_count = False
+
+
+@admin.register(MaterialDailyStat)
+class MaterialDailyStatAdmin(admin.ModelAdmin):
+    list_display = ['material', 'day', 'downloads', 'unique_users', 'views']
+    date_hierarchy = 'day'
+    list_select_related = ['material']
+    search_fields = ['material__title']
+    readonly_fields = ['material', 'day', 'downloads', 'unique_users', 'views']
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(MaterialNeighbour)
+class MaterialNeighbourAdmin(admin.ModelAdmin):
+    """build_material_recommendations əmri ilə yenidən yaradılır - əl ilə dəyişiklik itir"""
+    list_display = ['material', 'rank', 'neighbour', 'score']
+    list_select_related = ['material', 'neighbour']
+    search_fields = ['material__title']
+    readonly_fields = ['material', 'neighbour', 'rank', 'score']
+    
+    def has_add_permission(self, request):
+        return False
 
 
 @admin.register(LearningProgress)
@@ -0,0 +1,149 @@
+"""Yükləmə jurnalının (MaterialDownload) asinxron, toplu yazılması.
+
+Sorğu yalnız qeydi yaddaşdakı növbəyə qoyur; fon axını növbədən batch_size
+qədər (və ya interval saniyə gözləyib nə varsa) götürür və bir bulk_create
+ilə yazır. download_count sayğacı bura aid deyil - o, baxışlar kimi
+apps.core.counters buferindən keçir.
+
+Növbə max_pending ilə məhduddur: dolubsa qeyd sorğunun özündə yazılır
+(itmir, sadəcə həmin sorğu yavaşlayır). Baza məşğul olduqda
+(OperationalError) batch növbəyə qaytarılır və yalnız növbədə yer qalmayan
+qeydlər atılır. Batch-da xarici açarı pozan qeyd varsa (arada silinmiş
+material və ya istifadəçi), qeydlər tək-tək yazılır və yalnız pozanlar
+atılır. Proses dayananda növbə boşaldılır.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.db import IntegrityError, OperationalError, connections, transaction
+from django.utils import timezone
+
+from .models import MaterialDownload
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class DownloadLog:
+    """Yükləmə qeydləri üçün məhdud növbə və onu boşaldan tək fon axını"""
+
+    def __init__(self, batch_size=200, interval=2.0, max_pending=10_000):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, material_id, user_id, ip_address=None):
+        row = MaterialDownload(
+            material_id=material_id, user_id=user_id, ip_address=ip_address, downloaded_at=timezone.now()
+        )
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning('Yükləmə jurnalının növbəsi doludur, qeyd birbaşa yazılır')
+            self.write([row])
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='download-log', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        """Ən azı bir qeyd gələnə qədər gözlə, sonra interval ərzində toplananları götür"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is _STOP
+            rows = [row for row in batch if row is not _STOP]
+            try:
+                if rows:
+                    self.write(rows)
+            except OperationalError:
+                # Baza məşğuldur - növbəti dəfə yenidən cəhd edilir
+                logger.exception('%d yükləmə qeydi yazıla bilmədi', len(rows))
+                self._requeue(rows)
+                if not stop:
+                    time.sleep(self.interval)
+            except Exception:  # noqa: BLE001 - fon axını dayanmamalıdır
+                logger.exception('%d yükləmə qeydi yazıla bilmədi', len(rows))
+            finally:
+                connections.close_all()
+            if stop:
+                return
+
+    def _requeue(self, rows):
+        """Qeydləri növbəyə qaytar; max_pending dolubsa qalanlar atılır"""
+        for index, row in enumerate(rows):
+            row.pk = None
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                logger.error('Yükləmə jurnalının növbəsi doludur, %d qeyd atıldı', len(rows) - index)
+                return
+
+    def write(self, rows):
+        """Qeydləri bir bulk_create ilə yaz; xarici açar pozulursa tək-tək yaz"""
+        try:
+            with transaction.atomic():
+                MaterialDownload.objects.bulk_create(rows, batch_size=self.batch_size)
+        except IntegrityError:
+            self._write_each(rows)
+
+    def _write_each(self, rows):
+        dropped = 0
+        for row in rows:
+            row.pk = None
+            try:
+                with transaction.atomic():
+                    MaterialDownload.objects.bulk_create([row])
+            except IntegrityError:
+                dropped += 1
+        if dropped:
+            logger.warning('%d yükləmə qeydi atıldı: material və ya istifadəçi artıq yoxdur', dropped)
+
+    def flush(self, timeout=10):
+        """Fon axınını dayandır və növbədə qalanların hamısını yaz"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                thread.join(timeout)
+            except queue.Full:
+                pass
+        rows = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                rows.append(row)
+        if rows:
+            self.write(rows)
+        return len(rows)
+
+
+download_log = DownloadLog()
+atexit.register(download_log.flush)
@@ -0,0 +1,97 @@
+"""Material kataloqu üçün icazəli sıralamalar və keyset (kursor) səhifələmə.
+
+Sıralama yalnız SORTS-dakı açarlarla mümkündür; hər birinin indeksi var və
+sonunda id unikal bərabərlik ayırıcısıdır. Növbəti səhifə OFFSET ilə yox,
+əvvəlki səhifənin son sətrinin dəyərlərindən sonra başlayır:
+
+    WHERE a <= :a AND (a < :a OR b < :b OR (b = :b AND id < :id))
+
+Birinci şərt indeks üzrə diapazon axtarışı verir, buna görə 500-cü səhifə
+də 1-ci qədər ucuzdur. Kursor imzalıdır - müştəri onun içini dəyişə bilməz.
+"""
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import Q
+
+
+SALT = 'kids_content.catalog'
+DEFAULT_SORT = 'newest'
+
+# açar: ((sahə, azalan?), ...) - id həmişə sonuncudur
+SORTS = {
+    'newest': (('created_at', True), ('id', True)),
+    'popular': (('popularity', True), ('created_at', True), ('id', True)),
+    'rating': (('rating_average', True), ('created_at', True), ('id', True)),
+    'title': (('title', False), ('id', False)),
+}
+
+# material_list-in köhnə ?sort= dəyərləri
+ALIASES = {'-created_at': 'newest'}
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def normalize_sort(value):
+    value = ALIASES.get(value, value)
+    return value if value in SORTS else DEFAULT_SORT
+
+
+def order_by(sort):
+    return [f'-{name}' if descending else name for name, descending in SORTS[sort]]
+
+
+def sort_queryset(queryset, sort):
+    return queryset.order_by(*order_by(sort))
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def make_cursor(sort, obj):
+    values = [_encode(getattr(obj, name)) for name, _ in SORTS[sort]]
+    return signing.dumps([sort, values], salt=SALT, compress=True)
+
+
+def read_cursor(cursor, sort):
+    try:
+        cursor_sort, values = signing.loads(cursor, salt=SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidCursor('Kursor etibarsızdır.')
+    if cursor_sort != sort or len(values) != len(SORTS[sort]):
+        raise InvalidCursor('Kursor bu sıralama üçün deyil.')
+    decoded = []
+    for (name, _), value in zip(SORTS[sort], values):
+        decoded.append(datetime.fromisoformat(value) if name == 'created_at' else value)
+    return decoded
+
+
+def after(sort, values):
+    """Kursordan sonrakı sətirlər üçün şərt (indeks diapazonu + leksikoqrafik müqayisə)"""
+    fields = SORTS[sort]
+    first_name, first_descending = fields[0]
+    first_value = values[0]
+    strict = 'lt' if first_descending else 'gt'
+    bound = Q(**{f'{first_name}__{"lte" if first_descending else "gte"}': first_value})
+
+    rest = Q(**{f'{first_name}__{strict}': first_value})
+    equal = {}
+    for (name, descending), value in zip(fields[1:], values[1:]):
+        lookup = 'lt' if descending else 'gt'
+        rest |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return bound & rest
+
+
+def paginate(queryset, sort, cursor=None, limit=12):
+    """(obyektlər, növbəti kursor və ya None) - COUNT(*) və OFFSET yoxdur"""
+    sort = normalize_sort(sort)
+    queryset = sort_queryset(queryset, sort)
+    if cursor:
+        queryset = queryset.filter(after(sort, read_cursor(cursor, sort)))
+    items = list(queryset[:limit + 1])
+    next_cursor = make_cursor(sort, items[limit - 1]) if len(items) > limit else None
+    return items[:limit], next_cursor
@@ -0,0 +1,153 @@
+"""Qorunan material fayllarının çatdırılması.
+
+İcazə yoxlaması view-da qalır, fayl isə yaddaşa oxunmadan göndərilir:
+
+- MATERIAL_DELIVERY = 'django' (standart): fayl storage-dən hissə-hissə
+  axınla oxunur, Range (206/416), If-Range və şərti sorğular (304/412)
+  dəstəklənir;
+- 'accel': nginx X-Accel-Redirect - cavabı proksi özü verir (Range də
+  onundur). MATERIAL_ACCEL_PREFIX nginx-də `internal` location olmalıdır:
+      location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+- 'sendfile': Apache/lighttpd X-Sendfile - storage.path() ilə.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def delivery_mode():
+    return getattr(settings, 'MATERIAL_DELIVERY', 'django')
+
+
+def file_metadata(fieldfile):
+    """(size, mtime) - mtime storage vermirsə None"""
+    size = fieldfile.size
+    try:
+        mtime = fieldfile.storage.get_modified_time(fieldfile.name).timestamp()
+    except (NotImplementedError, OSError):
+        mtime = None
+    return size, mtime
+
+
+def make_etag(size, mtime):
+    return quote_etag(f'{size:x}-{int(mtime or 0):x}')
+
+
+def parse_range(header, size):
+    """Tək byte aralığı: (start, end) daxil olmaqla, None - başlıq yoxdur və ya
+    dəstəklənmir (tam fayl göndərilir), False - ödənilə bilməz (416)."""
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-500: son 500 bayt
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def range_applies(request, etag, mtime):
+    """If-Range uyğun gəlmirsə (fayl dəyişib) Range nəzərə alınmır"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and mtime is not None and int(mtime) <= since
+
+
+def iter_range(fieldfile, start, length, chunk_size=CHUNK_SIZE):
+    with fieldfile.storage.open(fieldfile.name, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def content_disposition(filename, as_attachment):
+    disposition = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return f'{disposition}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=utf-8''{quote(filename)}"
+
+
+def serve_file(request, fieldfile, as_attachment=True):
+    """FieldFile-ı icazə yoxlamasından sonra göndər (MATERIAL_DELIVERY rejimi ilə)"""
+    filename = os.path.basename(fieldfile.name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    mode = delivery_mode()
+
+    if mode in ('accel', 'sendfile'):
+        response = HttpResponse(content_type=content_type)
+        if mode == 'accel':
+            prefix = getattr(settings, 'MATERIAL_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = quote(prefix + fieldfile.name)
+        else:
+            response['X-Sendfile'] = fieldfile.path
+        response['Content-Disposition'] = content_disposition(filename, as_attachment)
+        return response
+
+    size, mtime = file_metadata(fieldfile)
+    etag = make_etag(size, mtime)
+    conditional = get_conditional_response(request, etag=etag, last_modified=mtime and int(mtime))
+    if conditional is not None:
+        return conditional
+
+    byte_range = None
+    if range_applies(request, etag, mtime):
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        response = FileResponse(
+            fieldfile.storage.open(fieldfile.name, 'rb'), as_attachment=as_attachment, filename=filename, content_type=content_type
+        )
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_range(fieldfile, start, end - start + 1), status=206, content_type=content_type
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = content_disposition(filename, as_attachment)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    if mtime is not None:
+        response['Last-Modified'] = http_date(mtime)
+    return response
+
+
+def is_initial_request(request):
+    """Yükləmənin ilk sorğusu - video/audio oynadarkən gələn sonrakı Range
+    sorğuları yükləmə kimi sayılmasın"""
+    match = RANGE_RE.match(request.headers.get('Range', '').strip())
+    return match is None or match.group(1) == '0'
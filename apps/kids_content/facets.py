@@ -0,0 +1,121 @@
+"""Material filtr paneli üçün faset sayları - bir sorğuda.
+
+Hər faset dəyəri üçün say, həmin fasetin öz filtri xaric, qalan bütün aktiv
+filtrlərlə hesablanır (seçim dəyişəndə nə qədər nəticə olacağını göstərir).
+Bütün saylar bir keçidli şərtli aqreqasiya ilə gəlir:
+
+    SELECT COUNT(id) FILTER (WHERE age_group = '3-5' AND category_id = 2), ...
+
+Axtarış siyahıdakı ilə eyni şərtdir (search_condition) və eyni dəyərlə
+işləyir. Nəticə normallaşdırılmış filtr açarı ilə cache-də saxlanılır;
+KidsMaterial və ya ContentCategory dəyişəndə versiya artırılır və bütün
+açarlar köhnəlir.
+"""
+import hashlib
+import json
+import string
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.core import stamps
+
+from .models import KidsMaterial
+
+
+VERSION_KEY = 'kids:facets:version'
+TIMEOUT = 10 * 60
+
+# faset: model sahəsi
+FIELDS = {
+    'category': 'category_id',
+    'material_type': 'material_type',
+    'age_group': 'age_group',
+    'difficulty_level': 'difficulty_level',
+    'is_premium': 'is_premium',
+}
+
+# Açarda axtarışın yalnız ASCII hərfləri kiçildilir: icontains bunları hər
+# bazada (SQLite LIKE də) eyni sayır, qalan hərflərin qatlanması bazadan asılıdır
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def search_condition(search):
+    """Material axtarışı - siyahı (filter_materials) və faset sayları üçün ortaq"""
+    return Q(title__icontains=search) | Q(description__icontains=search) | Q(content__icontains=search)
+
+
+def normalize(form):
+    """Aktiv filtrlər: {'category': '2', 'search': 'nağıl', ...} - etibarsız forma filtrsiz sayılır"""
+    filters = {}
+    if form.is_valid():
+        filters = {name: str(value) for name, value in form.cleaned_data.items() if name in FIELDS and value}
+    search = form.data.get('search')
+    if search:
+        filters['search'] = search
+    return filters
+
+
+def facet_values(form):
+    """Hər faset üçün mümkün dəyərlər (formanın seçimlərindən)"""
+    values = {
+        name: [str(value) for value, _ in form.fields[name].choices if value != '']
+        for name in ('category', 'material_type', 'age_group', 'difficulty_level')
+    }
+    values['is_premium'] = ['True']
+    return values
+
+
+def cache_key(filters):
+    version = stamps.get(VERSION_KEY)
+    if 'search' in filters:
+        filters = {**filters, 'search': filters['search'].translate(ASCII_LOWER)}
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    return f'kids:facets:{version}:{digest}'
+
+
+def _condition(name, value):
+    if name == 'is_premium':
+        return Q(is_premium=True)
+    if name == 'category':
+        return Q(category_id=int(value))
+    return Q(**{FIELDS[name]: value})
+
+
+def compute(filters, values):
+    """{faset: {dəyər: say}, 'total': say} - bir aqreqat sorğu"""
+    materials = KidsMaterial.objects.all()
+    search = filters.get('search')
+    if search:
+        materials = materials.filter(search_condition(search))
+
+    active = {name: _condition(name, value) for name, value in filters.items() if name in FIELDS}
+    aggregates = {'total': Count('pk', filter=Q(*active.values()) or None)}
+    aliases = {}
+    for name, options in values.items():
+        others = [condition for other, condition in active.items() if other != name]
+        for value in options:
+            alias = f'f{len(aliases)}'
+            aliases[alias] = (name, value)
+            aggregates[alias] = Count('pk', filter=Q(*others, _condition(name, value)))
+
+    row = materials.aggregate(**aggregates)
+    result = {name: {} for name in values}
+    for alias, (name, value) in aliases.items():
+        result[name][value] = row[alias]
+    result['total'] = row['total']
+    return result
+
+
+def get_facets(form):
+    filters = normalize(form)
+    key = cache_key(filters)
+    result = cache.get(key)
+    if result is None:
+        result = compute(filters, facet_values(form))
+        cache.set(key, result, TIMEOUT)
+    return result
+
+
+def invalidate():
+    stamps.bump(VERSION_KEY)
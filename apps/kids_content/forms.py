@@ -1,4 +1,5 @@
 from django import forms
+from apps.core import refdata
 from .models import MaterialRating, KidsMaterial
 
 
@@ -51,6 +52,14 @@ class MaterialFilterForm(forms.Form):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        from .models import ContentCategory
-        categories = ContentCategory.objects.all()
-        self.fields['category'].choices += [(cat.id, cat.name) for cat in categories]
+        self.fields['category'].choices += refdata.content_categories.choices()
+
+    def show_counts(self, facets):
+        """Seçimlərin yanında faset saylarını göstər (facets.get_facets nəticəsi)"""
+        for name in ('category', 'material_type', 'age_group', 'difficulty_level'):
+            counts = facets.get(name, {})
+            self.fields[name].choices = [
+                (value, f'{label} ({counts.get(str(value), 0)})' if value != '' else label)
+                for value, label in self.fields[name].choices
+            ]
+        self.fields['is_premium'].label = f"Premium ({facets.get('is_premium', {}).get('True', 0)})"
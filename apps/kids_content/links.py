@@ -0,0 +1,54 @@
+"""Material faylları üçün imzalı, müddətli yükləmə linkləri.
+
+download_material icazəni (premium üzvlük) bir dəfə yoxlayır və istifadəçini
+imzalı linkə yönləndirir. Link material, istifadəçi, fayl adı və bitmə
+vaxtını HMAC ilə imzalayır, buna görə serve_link heç bir cədvələ baxmadan
+faylı göndərir - media oynadıcılarının təkrar Range sorğuları ucuz qalır.
+Bitmə vaxtı pəncərəyə yuvarlaqlaşdırılır ki, eyni istifadəçi bir müddət eyni
+URL-i alsın və brauzer onu keşləyə bilsin.
+"""
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+
+
+SALT = 'kids_content.download'
+DEFAULT_TTL = 15 * 60
+
+
+class InvalidLink(Exception):
+    pass
+
+
+class ExpiredLink(InvalidLink):
+    pass
+
+
+def link_ttl():
+    return getattr(settings, 'MATERIAL_LINK_TTL', DEFAULT_TTL)
+
+
+def make_token(material, user, as_attachment=True, now=None):
+    ttl = link_ttl()
+    now = int(now or time.time())
+    # Pəncərənin sonundan ən azı bir ttl sonra bitir: link həmişə >= ttl etibarlıdır
+    expires = (now // ttl + 2) * ttl
+    payload = [material.pk, user.pk, expires, material.file.name, int(as_attachment)]
+    return signing.dumps(payload, salt=SALT, compress=True)
+
+
+def make_url(material, user, as_attachment=True):
+    return reverse('kids_content:serve_link', kwargs={'token': make_token(material, user, as_attachment)})
+
+
+def verify_token(token, now=None):
+    """İmzanı və müddəti yoxla; (material_id, user_id, fayl adı, as_attachment, expires)"""
+    try:
+        material_id, user_id, expires, name, as_attachment = signing.loads(token, salt=SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidLink('Link etibarsızdır.')
+    if (now or time.time()) > expires:
+        raise ExpiredLink('Linkin müddəti bitib.')
+    return material_id, user_id, name, bool(as_attachment), expires
@@ -0,0 +1,66 @@
+"""Detal səhifələri üçün sabit sayda sorğu ilə məlumat yükləyiciləri.
+
+Material, kateqoriya, reytinq xülasəsi və baxanın öz vəziyyəti (qiyməti,
+tərəqqisi, sevimli olub-olmaması) bir sorğuda gəlir; son rəylər və oxşar
+materiallar (oflayn hesablanmış MaterialNeighbour) ayrıca bir sorğudur.
+Oxuma zamanı heç nə yazılmır - tərəqqi sətri ilk real hərəkətdə
+(update_progress) yaradılır.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from django.db.models import Exists, FilteredRelation, OuterRef, Q
+from django.shortcuts import get_object_or_404
+
+from .models import Favorite, KidsMaterial, LearningProgress, MaterialNeighbour, MaterialRating
+
+
+@dataclass
+class MaterialPage:
+    material: KidsMaterial
+    ratings: List[MaterialRating] = field(default_factory=list)
+    related_materials: List[KidsMaterial] = field(default_factory=list)
+    user_rating: Optional[MaterialRating] = None
+    user_progress: Optional[LearningProgress] = None
+    is_favorite: bool = False
+    
+    @property
+    def rating_summary(self):
+        return getattr(self.material, 'rating_summary', None)
+
+
+def material_queryset(user):
+    queryset = KidsMaterial.objects.select_related('category', 'rating_summary').annotate(
+        has_neighbours=Exists(MaterialNeighbour.objects.filter(material=OuterRef('pk'))),
+    )
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        viewer_progress=FilteredRelation('progress_records', condition=Q(progress_records__user=user)),
+        viewer_rating=FilteredRelation('ratings', condition=Q(ratings__user=user)),
+        is_favorite=Exists(Favorite.objects.filter(material=OuterRef('pk'), user=user)),
+    ).select_related('viewer_progress', 'viewer_rating')
+
+
+def related_materials(material):
+    """Oflayn hesablanmış qonşular (recommendations); hələ hesablanmayıbsa eyni kateqoriya və yaş qrupu"""
+    if material.has_neighbours:
+        return KidsMaterial.objects.filter(neighbour_of__material=material).order_by('neighbour_of__rank')
+    return KidsMaterial.objects.filter(
+        category_id=material.category_id, age_group=material.age_group,
+    ).exclude(pk=material.pk)
+
+
+def load_material_page(pk, user, ratings_limit=5, related_limit=4):
+    """3 sorğu: material + baxanın vəziyyəti, son rəylər, oxşar materiallar"""
+    material = get_object_or_404(material_queryset(user), pk=pk)
+    page = MaterialPage(material=material)
+    page.ratings = list(material.ratings.select_related('user')[:ratings_limit])
+    page.related_materials = list(related_materials(material)[:related_limit])
+    if user.is_authenticated:
+        page.is_favorite = material.is_favorite
+        # FilteredRelation boş qaldıqda atribut təyin olunmur
+        page.user_rating = getattr(material, 'viewer_rating', None)
+        # Hələ sətir yoxdursa yadda saxlanmamış obyekt - forma üçün standart dəyərlər
+        page.user_progress = getattr(material, 'viewer_progress', None) or LearningProgress(material=material, user=user)
+    return page
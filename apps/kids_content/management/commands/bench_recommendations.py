@@ -0,0 +1,52 @@
+import resource
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Tövsiyə hesablamasının benchmark-ı: sintetik istifadəçi × material matrisində '
+            'oxşarlıq və top-K qonşuların hesablanma vaxtı və yaddaşı (bazaya yazmır)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--materials', type=int, default=10_000)
+        parser.add_argument('--per-user', type=int, default=20, help='İstifadəçi başına orta interaksiya')
+        parser.add_argument('--top-k', type=int, default=8)
+        parser.add_argument('--block-size', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            import numpy as np
+            from apps.kids_content.recommendations import build_matrix, similar_items
+        except ImportError as exc:
+            raise CommandError(f'Bu əmr üçün numpy və scipy lazımdır ({exc}).')
+
+        rng = np.random.default_rng(options['seed'])
+        n_users, n_materials = options['users'], options['materials']
+        counts = rng.poisson(options['per_user'], n_users)
+        users = np.repeat(np.arange(n_users, dtype=np.int64), counts)
+        # Populyarlıq Zipf-ə yaxın paylanır: az sayda material interaksiyaların çoxunu alır
+        popularity = 1 / np.arange(1, n_materials + 1) ** 0.8
+        items = rng.choice(n_materials, size=len(users), p=popularity / popularity.sum()).astype(np.int64)
+        weights = rng.choice(np.array([3.0, 2.0, 1.0], dtype=np.float32), size=len(users), p=[0.2, 0.2, 0.6])
+        self.stdout.write(f'{n_users} istifadəçi × {n_materials} material, {len(users)} interaksiya')
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        matrix, item_ids = build_matrix(users, items, weights)
+        built = time.perf_counter()
+        neighbours, scores = similar_items(matrix, options['top_k'], options['block_size'])
+        finished = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        filled = (neighbours >= 0).sum(axis=1)
+        self.stdout.write(f'Matris: {matrix.nnz} sıfırdan fərqli, {built - started:.2f} san')
+        self.stdout.write(f'Oxşarlıq + top-{options["top_k"]}: {finished - built:.2f} san')
+        self.stdout.write(f'Pik yaddaş (tracemalloc): {peak / 2**20:.0f} MB, '
+                          f'prosesin maksimumu: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB')
+        self.stdout.write(f'Tam {options["top_k"]} qonşusu olan materiallar: '
+                          f'{(filled == options["top_k"]).sum()} / {len(item_ids)}')
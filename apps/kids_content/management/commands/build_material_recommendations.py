@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Sevimlilər, tamamlanmış tərəqqi və yükləmələrdən material × material oxşarlığını '
+            'hesablayır və hər material üçün ən yaxın qonşuları MaterialNeighbour cədvəlinə yazır')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=None, help='Material başına qonşu sayı')
+        parser.add_argument('--block-size', type=int, default=500,
+                            help='Bir addımda hesablanan sütun sayı (yaddaş ~ materiallar × blok × 4 bayt)')
+
+    def handle(self, *args, **options):
+        try:
+            from apps.kids_content.recommendations import rebuild
+        except ImportError as exc:
+            raise CommandError(f'Bu əmr üçün numpy və scipy lazımdır ({exc}).')
+
+        started = time.perf_counter()
+        interactions, materials, written = rebuild(options['top_k'], options['block_size'])
+        self.stdout.write(
+            f'İnteraksiyalar: {interactions}, materiallar: {materials}, yazılan qonşular: {written} '
+            f'({time.perf_counter() - started:.1f} san)'
+        )
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.kids_content.rollups import retention_days, run_rollups
+
+
+class Command(BaseCommand):
+    help = ('Yükləmə jurnalını günlük statistikaya köçürür, populyarlığı yeniləyir '
+            'və saxlama müddəti keçmiş xam yükləmə qeydlərini silir')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help=f'Xam qeydlərin saxlanma müddəti (standart: {retention_days()})')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Saniyə; verilərsə əmr dayandırılana qədər dövri işləyir')
+
+    def handle(self, *args, **options):
+        while True:
+            downloads, compacted = run_rollups(options['retention_days'])
+            self.stdout.write(f'Yükləmələr: {downloads}, silinən xam qeydlər: {compacted}')
+            if not options['interval']:
+                break
+            connections.close_all()
+            time.sleep(options['interval'])
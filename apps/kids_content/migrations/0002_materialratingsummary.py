@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def fill_summaries(apps, schema_editor):
+    Summary = apps.get_model('kids_content', 'MaterialRatingSummary')
+    rows = (
+        apps.get_model('kids_content', 'MaterialRating').objects.order_by()
+        .values('material_id')
+        .annotate(
+            count=Count('pk'),
+            total=Sum('rating'),
+            **{f'star_{star}': Count('pk', filter=Q(rating=star)) for star in range(1, 6)}
+        )
+    )
+    Summary.objects.bulk_create([Summary(**row) for row in rows], batch_size=500)
+    KidsMaterial = apps.get_model('kids_content', 'KidsMaterial')
+    for summary in Summary.objects.all():
+        KidsMaterial.objects.filter(pk=summary.material_id).update(rating_average=summary.total / summary.count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Rəy sayı')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Qiymətlərin cəmi')),
+                ('star_1', models.PositiveIntegerField(default=0)),
+                ('star_2', models.PositiveIntegerField(default=0)),
+                ('star_3', models.PositiveIntegerField(default=0)),
+                ('star_4', models.PositiveIntegerField(default=0)),
+                ('star_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Material Reytinqi',
+                'verbose_name_plural': 'Material Reytinqləri',
+            },
+        ),
+        migrations.AddField(
+            model_name='kidsmaterial',
+            name='rating_average',
+            field=models.FloatField(default=0, editable=False, verbose_name='Orta qiymət'),
+        ),
+        migrations.AddIndex(
+            model_name='kidsmaterial',
+            index=models.Index(fields=['rating_average', 'created_at'], name='kids_rating_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='materialratingsummary',
+            name='material',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating_summary', to='kids_content.kidsmaterial', verbose_name='Material'),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
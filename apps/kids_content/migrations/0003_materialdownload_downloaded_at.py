@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0002_materialratingsummary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='materialdownload',
+            name='downloaded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_views(apps, schema_editor):
+    # Əvvəlki baxışların günü məlum deyil - rollup yalnız bundan sonrakıları sayır.
+    # popularity ilk rollup işinə qədər köhnə "populyar" sıralamasını saxlayır.
+    KidsMaterial = apps.get_model('kids_content', 'KidsMaterial')
+    KidsMaterial.objects.update(
+        views_rolled_up=models.F('view_count'),
+        popularity=models.F('view_count') + models.F('download_count'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0003_materialdownload_downloaded_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Gün')),
+                ('downloads', models.PositiveIntegerField(default=0, verbose_name='Yükləmələr')),
+                ('unique_users', models.PositiveIntegerField(default=0, verbose_name='Unikal istifadəçilər')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Baxışlar')),
+            ],
+            options={
+                'verbose_name': 'Günlük Statistika',
+                'verbose_name_plural': 'Günlük Statistika',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatsCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistika Nöqtəsi',
+                'verbose_name_plural': 'Statistika Nöqtələri',
+            },
+        ),
+        migrations.AddField(
+            model_name='kidsmaterial',
+            name='popularity',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Populyarlıq'),
+        ),
+        migrations.AddField(
+            model_name='kidsmaterial',
+            name='views_rolled_up',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='kidsmaterial',
+            index=models.Index(fields=['popularity', 'created_at'], name='kids_popularity_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materialdownload',
+            index=models.Index(fields=['downloaded_at'], name='kids_download_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='materialdailystat',
+            name='material',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='kids_content.kidsmaterial', verbose_name='Material'),
+        ),
+        migrations.AddIndex(
+            model_name='materialdailystat',
+            index=models.Index(fields=['day', 'material'], name='kids_stat_day_material_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='materialdailystat',
+            constraint=models.UniqueConstraint(fields=('material', 'day'), name='kids_stat_material_day_unique'),
+        ),
+        migrations.RunPython(mark_existing_views, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0004_material_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kidsmaterial',
+            index=models.Index(fields=['created_at'], name='kids_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kidsmaterial',
+            index=models.Index(fields=['title'], name='kids_title_idx'),
+        ),
+    ]
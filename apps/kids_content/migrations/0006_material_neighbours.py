@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0005_catalog_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Sıra')),
+                ('score', models.FloatField(default=0, verbose_name='Oxşarlıq')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='kids_content.kidsmaterial', verbose_name='Material')),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbour_of', to='kids_content.kidsmaterial', verbose_name='Oxşar material')),
+            ],
+            options={
+                'verbose_name': 'Oxşar Material',
+                'verbose_name_plural': 'Oxşar Materiallar',
+                'ordering': ['material', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('material', 'rank'), name='kids_neighbour_material_rank_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0006_material_neighbours'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kidsmaterial',
+            index=models.Index(fields=['age_group', 'popularity', 'created_at'], name='kids_age_popularity_idx'),
+        ),
+    ]
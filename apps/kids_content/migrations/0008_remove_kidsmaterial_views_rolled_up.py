@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:10
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def credit_unrolled_views(apps, schema_editor):
+    # Köhnə capture_views işinin hələ köçürmədiyi baxışların günü məlum deyil -
+    # bir dəfəlik bu günə yazılır; bundan sonra baxışlar buferdə günə görə yığılır
+    KidsMaterial = apps.get_model('kids_content', 'KidsMaterial')
+    MaterialDailyStat = apps.get_model('kids_content', 'MaterialDailyStat')
+    today = timezone.localdate()
+    deltas = (
+        KidsMaterial.objects.filter(view_count__gt=models.F('views_rolled_up'))
+        .annotate(delta=models.F('view_count') - models.F('views_rolled_up'))
+        .values_list('pk', 'delta')
+    )
+    for pk, delta in deltas:
+        stat, _ = MaterialDailyStat.objects.get_or_create(material_id=pk, day=today)
+        MaterialDailyStat.objects.filter(pk=stat.pk).update(views=models.F('views') + delta)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kids_content', '0007_feed_age_popularity_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(credit_unrolled_views, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='kidsmaterial',
+            name='views_rolled_up',
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import User
+from apps.core.models import RatingSummary
 
 
 class ContentCategory(models.Model):
@@ -70,6 +72,9 @@ class KidsMaterial(models.Model):
     is_featured = models.BooleanField(default=False, verbose_name='Seçilmiş məzmun')
     download_count = models.IntegerField(default=0, verbose_name='Yükləmə sayı')
     view_count = models.IntegerField(default=0, verbose_name='Baxış sayı')
+    rating_average = models.FloatField(default=0, editable=False, verbose_name='Orta qiymət')
+    # Son MATERIAL_POPULAR_DAYS günün baxış + yükləmə cəmi (rollups.refresh_popularity)
+    popularity = models.IntegerField(default=0, editable=False, verbose_name='Populyarlıq')
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -78,6 +83,17 @@ class KidsMaterial(models.Model):
         verbose_name = 'Uşaq Materialı'
         verbose_name_plural = 'Uşaq Materialları'
         ordering = ['-created_at']
+        indexes = [
+            # catalog.SORTS: hər sıralamanın indeksi (id SQLite-da rowid kimi indeksə daxildir)
+            models.Index(fields=['created_at'], name='kids_created_idx'),
+            models.Index(fields=['title'], name='kids_title_idx'),
+            # ?sort=rating: ORDER BY rating_average DESC, created_at DESC
+            models.Index(fields=['rating_average', 'created_at'], name='kids_rating_created_idx'),
+            # ?sort=popular: ORDER BY popularity DESC, created_at DESC
+            models.Index(fields=['popularity', 'created_at'], name='kids_popularity_created_idx'),
+            # Uşaq lenti (membership.feed): WHERE age_group = ? ORDER BY popularity DESC, created_at DESC
+            models.Index(fields=['age_group', 'popularity', 'created_at'], name='kids_age_popularity_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -86,12 +102,17 @@ class KidsMaterial(models.Model):
         return reverse('kids_content:material_detail', kwargs={'pk': self.pk})
     
     def increment_view_count(self):
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """Baxışı toplu yazılmaq üçün növbəyə qoy (apps.core.counters)"""
+        self._increment('view_count')
     
     def increment_download_count(self):
-        self.download_count += 1
-        self.save(update_fields=['download_count'])
+        self._increment('download_count')
+    
+    def _increment(self, field):
+        from apps.core.counters import counter_buffer
+        counter_buffer.add(KidsMaterial, self.pk, field)
+        # Səhifədə hələ yazılmamış artımlar da görünsün
+        setattr(self, field, getattr(self, field) + counter_buffer.pending(KidsMaterial, self.pk, field))
 
 
 class MaterialRating(models.Model):
@@ -112,22 +133,105 @@ class MaterialRating(models.Model):
         return f"{self.user.get_full_name()} - {self.material.title} ({self.rating}/5)"
 
 
+class MaterialRatingSummary(RatingSummary):
+    """Material qiymətlərinin xülasəsi"""
+    target_field = 'material'
+    
+    material = models.OneToOneField(KidsMaterial, on_delete=models.CASCADE, related_name='rating_summary', verbose_name='Material')
+    
+    class Meta:
+        verbose_name = 'Material Reytinqi'
+        verbose_name_plural = 'Material Reytinqləri'
+    
+    def __str__(self):
+        return f"{self.material.title} ({self.count})"
+    
+    @classmethod
+    def summary_changed(cls, target_id):
+        # Sıralama üçün orta qiymət materialın öz indeksli sütununda saxlanılır
+        count, total = cls.objects.filter(material_id=target_id).values_list('count', 'total').first() or (0, 0)
+        KidsMaterial.objects.filter(pk=target_id).update(rating_average=total / count if count else 0)
+
+
 class MaterialDownload(models.Model):
     """Material yükləmələri"""
     material = models.ForeignKey(KidsMaterial, on_delete=models.CASCADE, related_name='downloads', verbose_name='Material')
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='İstifadəçi')
-    downloaded_at = models.DateTimeField(auto_now_add=True)
+    # Sorğu anı - qeyd fon axınında gecikmə ilə yazılır (audit.DownloadLog)
+    downloaded_at = models.DateTimeField(default=timezone.now, editable=False)
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     
     class Meta:
         verbose_name = 'Material Yükləməsi'
         verbose_name_plural = 'Material Yükləmələri'
         ordering = ['-downloaded_at']
+        indexes = [
+            # Günlük rollup və köhnə qeydlərin silinməsi tarix aralığı ilə işləyir
+            models.Index(fields=['downloaded_at'], name='kids_download_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.material.title}"
 
 
+class MaterialDailyStat(models.Model):
+    """Material üzrə günlük statistika - yükləmə jurnalı və baxış sayğacından toplanır"""
+    material = models.ForeignKey(KidsMaterial, on_delete=models.CASCADE, related_name='daily_stats', verbose_name='Material')
+    day = models.DateField(verbose_name='Gün')
+    downloads = models.PositiveIntegerField(default=0, verbose_name='Yükləmələr')
+    unique_users = models.PositiveIntegerField(default=0, verbose_name='Unikal istifadəçilər')
+    views = models.PositiveIntegerField(default=0, verbose_name='Baxışlar')
+    
+    class Meta:
+        verbose_name = 'Günlük Statistika'
+        verbose_name_plural = 'Günlük Statistika'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['material', 'day'], name='kids_stat_material_day_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'material'], name='kids_stat_day_material_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.material} - {self.day}"
+
+
+class StatsCheckpoint(models.Model):
+    """Artımlı işlərin harada qaldığı (məsələn, son işlənmiş MaterialDownload id-si)"""
+    name = models.CharField(max_length=50, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Statistika Nöqtəsi'
+        verbose_name_plural = 'Statistika Nöqtələri'
+    
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
+
+class MaterialNeighbour(models.Model):
+    """"Bunu bəyənənlər bunları da bəyəndi" - oflayn hesablanmış ən yaxın materiallar"""
+    material = models.ForeignKey(KidsMaterial, on_delete=models.CASCADE, related_name='neighbours', verbose_name='Material')
+    neighbour = models.ForeignKey(KidsMaterial, on_delete=models.CASCADE, related_name='neighbour_of', verbose_name='Oxşar material')
+    rank = models.PositiveSmallIntegerField(verbose_name='Sıra')
+    # Kosinus oxşarlığı; 0 - qarşılıqlı təsir yoxdur, kateqoriya üzrə doldurulub
+    score = models.FloatField(default=0, verbose_name='Oxşarlıq')
+    
+    class Meta:
+        verbose_name = 'Oxşar Material'
+        verbose_name_plural = 'Oxşar Materiallar'
+        ordering = ['material', 'rank']
+        constraints = [
+            # Detal səhifəsi: WHERE material_id = ? ORDER BY rank - bu indeksdən oxunur
+            models.UniqueConstraint(fields=['material', 'rank'], name='kids_neighbour_material_rank_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.material} → {self.neighbour}"
+
+
 class Favorite(models.Model):
     """Sevimli materiallar"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='favorites', verbose_name='İstifadəçi')
@@ -0,0 +1,147 @@
+"""Materiallar üçün "bunu bəyənənlər bunları da bəyəndi" tövsiyələri (oflayn).
+
+İstifadəçi × material seyrək matrisi üç mənbədən qurulur: sevimlilər,
+tamamlanmış tərəqqi və yükləmə jurnalı (çəkilər WEIGHTS-dədir; yükləmə
+jurnalı yalnız saxlanma müddəti daxilindədir). Sütunlar normallaşdırılıb
+kosinus oxşarlığı S = Xᵀ·X sətir blokları ilə hesablanır - yaddaşda eyni anda
+yalnız block_size × materiallar sıx blok olur. Hər material üçün ən yaxın top_k
+qonşu MaterialNeighbour cədvəlinə yazılır; az qonşusu olanlar eyni kateqoriya
+və yaş qrupunun populyar materialları ilə doldurulur (score=0).
+
+Detal səhifəsi yalnız cədvəli oxuyur - NumPy/SciPy yalnız bu iş üçün lazımdır.
+"""
+import itertools
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from scipy import sparse
+
+from .models import Favorite, KidsMaterial, LearningProgress, MaterialDownload, MaterialNeighbour
+
+
+WEIGHTS = {
+    'favorite': 3.0,
+    'completed': 2.0,
+    'download': 1.0,
+}
+
+
+def top_k():
+    return getattr(settings, 'MATERIAL_RECOMMENDATION_TOP_K', 8)
+
+
+def interaction_sources():
+    """(mənbə, (user_id, material_id) sorğusu) - cütlər hər mənbədə unikaldır"""
+    return [
+        ('favorite', Favorite.objects.order_by().values_list('user_id', 'material_id')),
+        ('completed', LearningProgress.objects.filter(status='completed').order_by().values_list('user_id', 'material_id')),
+        ('download', MaterialDownload.objects.order_by().values_list('user_id', 'material_id').distinct()),
+    ]
+
+
+def load_interactions():
+    """(user_ids, material_ids, weights) massivləri - sətirlər Python obyekti kimi yığılmır"""
+    users, items, weights = [], [], []
+    for source, queryset in interaction_sources():
+        pairs = np.fromiter(
+            itertools.chain.from_iterable(queryset.iterator(chunk_size=10_000)), dtype=np.int64,
+        ).reshape(-1, 2)
+        users.append(pairs[:, 0])
+        items.append(pairs[:, 1])
+        weights.append(np.full(len(pairs), WEIGHTS[source], dtype=np.float32))
+    return np.concatenate(users), np.concatenate(items), np.concatenate(weights)
+
+
+def build_matrix(users, items, weights):
+    """İstifadəçi × material CSR matrisi və sütun → material id massivi"""
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    item_ids, item_index = np.unique(items, return_inverse=True)
+    # Təkrarlanan (istifadəçi, material) cütlərinin çəkiləri toplanır
+    matrix = sparse.csr_matrix(
+        (weights, (user_index, item_index)), shape=(len(user_ids), len(item_ids)), dtype=np.float32,
+    )
+    matrix.sum_duplicates()
+    return matrix, item_ids
+
+
+def similar_items(matrix, k, block_size=500):
+    """Hər sütun üçün ən oxşar k sütun: (indekslər, oxşarlıqlar), boş yerlər -1 / 0"""
+    n_items = matrix.shape[1]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0), dtype=np.float32)).ravel()
+    norms[norms == 0] = 1
+    normalized = matrix @ sparse.diags(1 / norms, dtype=np.float32)
+    left = normalized.T.tocsr()
+    right = normalized.tocsc()
+
+    k = min(k, max(n_items - 1, 0))
+    neighbours = np.full((n_items, k), -1, dtype=np.int32)
+    scores = np.zeros((n_items, k), dtype=np.float32)
+    if not k:
+        return neighbours, scores
+
+    for start in range(0, n_items, block_size):
+        stop = min(start + block_size, n_items)
+        # S simmetrikdir: sətir bloku (blok × materiallar) yaddaşda ardıcıldır, seçim sürətli olur
+        block = (left[start:stop] @ right).toarray()
+        rows = np.arange(stop - start)
+        block[rows, start + rows] = 0  # özü ilə oxşarlıq
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        neighbours[start:stop] = np.where(top_scores > 0, top, -1)
+        scores[start:stop] = np.where(top_scores > 0, top_scores, 0)
+    return neighbours, scores
+
+
+def neighbour_rows(item_ids, neighbours, scores, k):
+    """MaterialNeighbour obyektləri; çatışmayan yerlər kateqoriya üzrə doldurulur"""
+    catalog = list(KidsMaterial.objects.order_by('-popularity', '-id').values_list('id', 'category_id', 'age_group'))
+    groups = {}
+    for material_id, category_id, age_group in catalog:
+        groups.setdefault((category_id, age_group), []).append(material_id)
+
+    # Hesablama zamanı silinmiş materiallar nə özü, nə də qonşu kimi yazılmır
+    existing = {material_id for material_id, _, _ in catalog}
+    item_list = item_ids.tolist()
+    found = {}
+    for material_id, row, row_scores in zip(item_list, neighbours.tolist(), scores.tolist()):
+        found[material_id] = [
+            (item_list[i], score) for i, score in zip(row, row_scores) if i >= 0 and item_list[i] in existing
+        ]
+
+    rows = []
+    for material_id, category_id, age_group in catalog:
+        picked = found.get(material_id, [])
+        seen = {material_id, *(neighbour for neighbour, _ in picked)}
+        for candidate in groups[category_id, age_group]:
+            if len(picked) >= k:
+                break
+            if candidate not in seen:
+                picked.append((candidate, 0.0))
+                seen.add(candidate)
+        rows.extend(
+            MaterialNeighbour(material_id=material_id, neighbour_id=neighbour, rank=rank, score=score)
+            for rank, (neighbour, score) in enumerate(picked[:k], start=1)
+        )
+    return rows
+
+
+def store(rows):
+    """Cədvəli bir tranzaksiyada tam əvəz et - səhifələr yarımçıq vəziyyət görmür"""
+    with transaction.atomic():
+        MaterialNeighbour.objects.all().delete()
+        MaterialNeighbour.objects.bulk_create(rows, batch_size=2000)
+    return len(rows)
+
+
+def rebuild(k=None, block_size=500):
+    """Bütün qonşuları yenidən hesabla; qaytarır: (interaksiya, material, yazılan sətir)"""
+    k = k or top_k()
+    users, items, weights = load_interactions()
+    matrix, item_ids = build_matrix(users, items, weights)
+    neighbours, scores = similar_items(matrix, k, block_size)
+    written = store(neighbour_rows(item_ids, neighbours, scores, k))
+    return matrix.nnz, len(item_ids), written
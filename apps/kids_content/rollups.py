@@ -0,0 +1,140 @@
+"""Yükləmə jurnalı və baxışlar üçün günlük rollup-lar.
+
+- rollup_downloads: son işlənmiş id-dən sonrakı MaterialDownload qeydlərini,
+  həmçinin əvvəlki işdən MATERIAL_ROLLUP_OVERLAP_SECONDS qabaqdan bəri
+  yazılanları oxuyur (id-lər commit sırası ilə gəlməyə bilər - gec commit
+  olunan kiçik id itməsin); onların aid olduğu günlər xam qeydlərdən
+  yenidən sayılır, buna görə təkrar oxumaq nəticəni dəyişmir və unikal
+  istifadəçi sayı düz qalır;
+- add_daily_views: baxışlar apps.core.counters buferində baş verdiyi günə
+  görə yığılır və sayğacla eyni tranzaksiyada həmin günün statistikasına
+  əlavə olunur (baxışların xam jurnalı yoxdur);
+- refresh_popularity: son MATERIAL_POPULAR_DAYS günün cəmini
+  KidsMaterial.popularity sütununa yazır - "populyar" sıralaması indeksdən
+  oxunur, jurnal skan edilmir;
+- compact_downloads: rollup-a düşmüş və MATERIAL_DOWNLOAD_RETENTION_DAYS
+  gündən köhnə xam qeydləri silir.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import KidsMaterial, MaterialDailyStat, MaterialDownload, StatsCheckpoint
+
+
+DOWNLOADS_CHECKPOINT = 'material_downloads'
+
+
+def popular_days():
+    return getattr(settings, 'MATERIAL_POPULAR_DAYS', 30)
+
+
+def retention_days():
+    return getattr(settings, 'MATERIAL_DOWNLOAD_RETENTION_DAYS', 90)
+
+
+def overlap_seconds():
+    return getattr(settings, 'MATERIAL_ROLLUP_OVERLAP_SECONDS', 10 * 60)
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def rollup_downloads():
+    """Yeni yükləmə qeydlərini günlük statistikaya köçür; qaytarır: işlənmiş qeyd sayı"""
+    with transaction.atomic():
+        checkpoint, created = StatsCheckpoint.objects.select_for_update().get_or_create(name=DOWNLOADS_CHECKPOINT)
+        last_id = MaterialDownload.objects.aggregate(last=Max('id'))['last'] or 0
+        new_rows = MaterialDownload.objects.filter(id__gt=checkpoint.position, id__lte=last_id)
+        processed = new_rows.count()
+
+        scanned = Q(id__gt=checkpoint.position, id__lte=last_id)
+        if not created:
+            # Əvvəlki işdən sonra commit olunmuş, amma id-si nöqtədən kiçik qeydlər
+            scanned |= Q(downloaded_at__gte=checkpoint.updated_at - timedelta(seconds=overlap_seconds()))
+        days = set(
+            MaterialDownload.objects.filter(scanned)
+            .annotate(day=TruncDate('downloaded_at'))
+            .values_list('day', flat=True).distinct()
+        )
+
+        stats = []
+        for day in sorted(days):
+            rows = (
+                MaterialDownload.objects
+                .filter(downloaded_at__gte=day_start(day), downloaded_at__lt=day_start(day + timedelta(days=1)))
+                .order_by()
+                .values('material_id')
+                .annotate(downloads=Count('id'), unique_users=Count('user_id', distinct=True))
+            )
+            stats.extend(MaterialDailyStat(day=day, **row) for row in rows)
+        MaterialDailyStat.objects.bulk_create(
+            stats, batch_size=500,
+            update_conflicts=True, unique_fields=['material', 'day'], update_fields=['downloads', 'unique_users'],
+        )
+
+        checkpoint.position = max(checkpoint.position, last_id)
+        checkpoint.save(update_fields=['position', 'updated_at'])
+    return processed
+
+
+def add_daily_views(day_counts):
+    """{(material_id, gün): baxış} - counter_buffer.flush() tranzaksiyası daxilində çağırılır"""
+    existing = set(
+        KidsMaterial.objects.filter(pk__in={pk for pk, _ in day_counts}).values_list('pk', flat=True)
+    )
+    # Sətirlər əvvəlcə yaradılır, sonra F() ilə artırılır - paralel flush-lar bir-birini üstələmir
+    MaterialDailyStat.objects.bulk_create(
+        [MaterialDailyStat(material_id=pk, day=day) for pk, day in day_counts if pk in existing],
+        batch_size=500, ignore_conflicts=True,
+    )
+    grouped = defaultdict(list)
+    for (pk, day), amount in day_counts.items():
+        if pk in existing:
+            grouped[day, amount].append(pk)
+    for (day, amount), pks in grouped.items():
+        MaterialDailyStat.objects.filter(day=day, material_id__in=pks).update(views=F('views') + amount)
+
+
+def refresh_popularity(today=None):
+    """popularity = son N günün baxış + yükləmə cəmi (bir UPDATE)"""
+    today = today or timezone.localdate()
+    window = (
+        MaterialDailyStat.objects
+        .filter(material=OuterRef('pk'), day__gt=today - timedelta(days=popular_days()))
+        .order_by()
+        .values('material')
+        .annotate(total=Sum('downloads') + Sum('views'))
+        .values('total')
+    )
+    return KidsMaterial.objects.update(
+        popularity=Coalesce(Subquery(window, output_field=IntegerField()), Value(0))
+    )
+
+
+def compact_downloads(days=None, today=None):
+    """Rollup-a düşmüş köhnə xam yükləmə qeydlərini sil; qaytarır: silinən say"""
+    today = today or timezone.localdate()
+    days = retention_days() if days is None else days
+    checkpoint = StatsCheckpoint.objects.filter(name=DOWNLOADS_CHECKPOINT).values_list('position', flat=True).first()
+    if not checkpoint:
+        return 0
+    deleted, _ = MaterialDownload.objects.filter(
+        id__lte=checkpoint,
+        downloaded_at__lt=day_start(today - timedelta(days=days)),
+    ).delete()
+    return deleted
+
+
+def run_rollups(retention=None, today=None):
+    """Bütün addımlar ardıcıl: (yükləmələr, silinən xam qeydlər)"""
+    downloads = rollup_downloads()
+    refresh_popularity(today)
+    compacted = compact_downloads(retention, today)
+    return downloads, compacted
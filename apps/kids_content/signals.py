@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.core.counters import counter_buffer
+from apps.core.ratings import track_ratings
+from . import facets
+from .models import ContentCategory, KidsMaterial, MaterialRating, MaterialRatingSummary
+from .rollups import add_daily_views
+
+
+track_ratings(MaterialRating, MaterialRatingSummary)
+counter_buffer.track_daily(KidsMaterial, 'view_count', add_daily_views)
+
+
+@receiver(post_save, sender=KidsMaterial)
+@receiver(post_delete, sender=KidsMaterial)
+@receiver(post_save, sender=ContentCategory)
+@receiver(post_delete, sender=ContentCategory)
+def invalidate_facets(sender, **kwargs):
+    facets.invalidate()
@@ -5,8 +5,10 @@ app_name = 'kids_content'
 
 urlpatterns = [
     path('', views.material_list, name='material_list'),
+    path('catalog/', views.material_catalog, name='material_catalog'),
     path('<int:pk>/', views.material_detail, name='material_detail'),
     path('<int:pk>/download/', views.download_material, name='download_material'),
+    path('files/<str:token>/', views.serve_link, name='serve_link'),
     path('<int:pk>/rating/', views.add_rating, name='add_rating'),
     path('<int:pk>/favorite/', views.toggle_favorite, name='toggle_favorite'),
     path('<int:pk>/progress/', views.update_progress, name='update_progress'),
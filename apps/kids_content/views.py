@@ -1,21 +1,22 @@
+import time
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Avg, Count
-from django.http import HttpResponse, Http404
+from django.db.models.fields.files import FieldFile
+from django.http import Http404, HttpResponseForbidden, JsonResponse
 from django.utils import timezone
-from .models import KidsMaterial, ContentCategory, MaterialRating, Favorite, LearningProgress, MaterialDownload
+from .models import KidsMaterial, ContentCategory, MaterialRating, Favorite, LearningProgress
 from .forms import MaterialRatingForm, MaterialFilterForm
+from apps.core import refdata
+from . import catalog, delivery, facets, links
+from .audit import download_log
+from .loaders import load_material_page
 
 
-def material_list(request):
-    """Material siyahısı"""
-    materials = KidsMaterial.objects.all()
-    categories = ContentCategory.objects.all()
-    
-    # Filtrlər
-    form = MaterialFilterForm(request.GET)
+def filter_materials(materials, form):
+    """MaterialFilterForm və ?search= filtrləri (siyahı və JSON kataloq üçün ortaq)"""
     if form.is_valid():
         if form.cleaned_data['category']:
             materials = materials.filter(category_id=form.cleaned_data['category'])
@@ -29,22 +30,24 @@ def material_list(request):
             materials = materials.filter(is_premium=True)
     
     # Axtarış
-    search = request.GET.get('search')
+    search = form.data.get('search')
     if search:
-        materials = materials.filter(
-            Q(title__icontains=search) | 
-            Q(description__icontains=search) |
-            Q(content__icontains=search)
-        )
+        materials = materials.filter(facets.search_condition(search))
+    return materials
+
+
+def material_list(request):
+    """Material siyahısı"""
+    categories = refdata.content_categories.all()
+    form = MaterialFilterForm(request.GET)
+    materials = filter_materials(KidsMaterial.objects.all(), form)
+    facet_counts = facets.get_facets(form)
+    form.show_counts(facet_counts)
+    search = request.GET.get('search')
     
-    # Sıralama
+    # Sıralama - yalnız indeksli, icazəli açarlar (catalog.SORTS)
     sort_by = request.GET.get('sort', '-created_at')
-    if sort_by == 'popular':
-        materials = materials.order_by('-view_count', '-download_count')
-    elif sort_by == 'rating':
-        materials = materials.annotate(avg_rating=Avg('ratings__rating')).order_by('-avg_rating')
-    else:
-        materials = materials.order_by(sort_by)
+    materials = catalog.sort_queryset(materials, catalog.normalize_sort(sort_by))
     
     # Seçilmiş materiallar
     featured_materials = KidsMaterial.objects.filter(is_featured=True)[:6]
@@ -60,56 +63,70 @@ def material_list(request):
         'featured_materials': featured_materials,
         'form': form,
         'search': search,
-        'sort_by': sort_by
+        'sort_by': sort_by,
+        'facet_counts': facet_counts
     })
 
 
 def material_detail(request, pk):
     """Material detalları"""
-    material = get_object_or_404(KidsMaterial, pk=pk)
+    page = load_material_page(pk, request.user)
+    material = page.material
     
     # Baxış sayını artır
     material.increment_view_count()
     
-    # Rəylər
-    ratings = material.ratings.all()
-    avg_rating = ratings.aggregate(Avg('rating'))['rating__avg']
-    
-    # İstifadəçi məlumatları
-    user_rating = None
-    is_favorite = False
-    user_progress = None
+    rating_summary = page.rating_summary
+    return render(request, 'kids_content/material_detail.html', {
+        'material': material,
+        'ratings': page.ratings,
+        'avg_rating': rating_summary.average if rating_summary else None,
+        'rating_summary': rating_summary,
+        'user_rating': page.user_rating,
+        'is_favorite': page.is_favorite,
+        'user_progress': page.user_progress,
+        'related_materials': page.related_materials
+    })
+
+
+def material_catalog(request):
+    """Sonsuz sürüşdürmə üçün JSON kataloq: ?sort=newest|popular|rating|title&cursor=...
     
-    if request.user.is_authenticated:
-        user_rating = MaterialRating.objects.filter(
-            material=material,
-            user=request.user
-        ).first()
-        
-        is_favorite = Favorite.objects.filter(
-            material=material,
-            user=request.user
-        ).exists()
-        
-        user_progress, created = LearningProgress.objects.get_or_create(
-            material=material,
-            user=request.user
-        )
+    Keyset səhifələmə - COUNT(*) və OFFSET yoxdur, hər səhifə eyni qiymətə başa gəlir.
+    """
+    form = MaterialFilterForm(request.GET)
+    materials = filter_materials(KidsMaterial.objects.select_related('category'), form)
+    try:
+        limit = min(max(int(request.GET.get('limit', 12)), 1), 50)
+    except ValueError:
+        limit = 12
+    sort = catalog.normalize_sort(request.GET.get('sort', catalog.DEFAULT_SORT))
     
-    # Oxşar materiallar
-    related_materials = KidsMaterial.objects.filter(
-        category=material.category,
-        age_group=material.age_group
-    ).exclude(pk=material.pk)[:4]
+    try:
+        items, next_cursor = catalog.paginate(materials, sort, request.GET.get('cursor'), limit)
+    except catalog.InvalidCursor as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
     
-    return render(request, 'kids_content/material_detail.html', {
-        'material': material,
-        'ratings': ratings[:5],
-        'avg_rating': avg_rating,
-        'user_rating': user_rating,
-        'is_favorite': is_favorite,
-        'user_progress': user_progress,
-        'related_materials': related_materials
+    return JsonResponse({
+        'sort': sort,
+        'next': next_cursor,
+        'results': [
+            {
+                'id': material.pk,
+                'title': material.title,
+                'url': material.get_absolute_url(),
+                'image': material.image.url if material.image else None,
+                'category': material.category.name,
+                'material_type': material.material_type,
+                'age_group': material.age_group,
+                'difficulty_level': material.difficulty_level,
+                'is_premium': material.is_premium,
+                'rating_average': round(material.rating_average, 2),
+                'view_count': material.view_count,
+                'created_at': material.created_at.isoformat(),
+            }
+            for material in items
+        ],
     })
 
 
@@ -133,19 +150,28 @@ def download_material(request, pk):
             messages.error(request, 'Premium məzmun üçün üzvlük tələb olunur.')
             return redirect('kids_content:material_detail', pk=pk)
     
-    # Yükləmə qeydini yarat
-    MaterialDownload.objects.create(
-        material=material,
-        user=request.user,
-        ip_address=request.META.get('REMOTE_ADDR')
-    )
+    # Yalnız ilk sorğu yükləmə sayılır (video oynadarkən gələn Range sorğuları yox)
+    # Jurnal qeydi (apps.kids_content.audit) və sayğac (apps.core.counters) toplu yazılır
+    if delivery.is_initial_request(request):
+        download_log.add(material.pk, request.user.pk, request.META.get('REMOTE_ADDR'))
+        material.increment_download_count()
     
-    # Yükləmə sayını artır
-    material.increment_download_count()
+    # Faylın özü imzalı linkdən verilir - təkrar sorğular icazəni yenidən yoxlamır
+    as_attachment = material.material_type not in ('video', 'audio')
+    return redirect(links.make_url(material, request.user, as_attachment=as_attachment))
+
+
+def serve_link(request, token):
+    """İmzalı linklə faylı göndər - baza sorğusu yoxdur (sessiya və istifadəçi oxunmur)"""
+    try:
+        material_id, user_id, name, as_attachment, expires = links.verify_token(token)
+    except links.InvalidLink as exc:
+        return HttpResponseForbidden(str(exc))
     
-    # Faylı göndər
-    response = HttpResponse(material.file.read(), content_type='application/octet-stream')
-    response['Content-Disposition'] = f'attachment; filename="{material.file.name}"'
+    field = KidsMaterial._meta.get_field('file')
+    response = delivery.serve_file(request, FieldFile(None, field, name), as_attachment=as_attachment)
+    # Link istifadəçiyə bağlıdır - yalnız brauzer keşləsin, paylaşılan proksilər yox
+    response['Cache-Control'] = f'private, max-age={max(int(expires - time.time()), 0)}'
     return response
 
 
@@ -4,13 +4,14 @@ from django.contrib import messages
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import datetime, timedelta
-from .models import Medal, MedalCategory, UserMedal, VirtualPassport, Achievement, UserAchievement, Leaderboard
+from apps.core import refdata
+from .models import Medal, UserMedal, VirtualPassport, Achievement, UserAchievement, Leaderboard
 from apps.membership.models import Child
 
 
 def medal_list(request):
     """Medal siyahısı"""
-    categories = MedalCategory.objects.all()
+    categories = refdata.medal_categories.all()
     medals = Medal.objects.filter(is_active=True)
     
     # Filtr
@@ -0,0 +1,117 @@
+"""Uşaq üçün "sənin üçün" lenti: yaşına uyğun gələcək tədbirlər və baxılmamış materiallar.
+
+Uşağın yaş qrupu SQL-də hesablanır (Child.objects.with_age_group), lent isə
+iki məhdud sorğudur: qrupuna və ya 'all'-a uyğun, hələ rezerv edilməmiş
+yaxın tədbirlər və valideynin hələ açmadığı (LearningProgress yoxdur) ən
+populyar materiallar. Dolu tədbirlər təklif edilmir. Nəticə uşaq üzrə
+cache-də saxlanılır; açarda yaş qrupu, kataloq versiyası (Event/KidsMaterial
+dəyişəndə, həmçinin update() ilə status və yer sayğacı dəyişəndə yenilənir) və
+istifadəçi versiyası (tərəqqi/rezervasiya dəyişəndə) var, müddəti isə uşağın
+növbəti yaş qrupuna keçdiyi günə qədərdir.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, time as day_time
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.core import stamps
+from apps.events.models import Booking, Event
+from apps.kids_content.models import KidsMaterial, LearningProgress
+
+
+CATALOG_VERSION_KEY = 'feed:catalog:version'
+# Bu statuslardakı rezervasiyası olan tədbir uşağa yenidən təklif edilmir
+BOOKED_STATUSES = ('pending', 'confirmed')
+
+
+def cache_timeout():
+    return getattr(settings, 'CHILD_FEED_CACHE_TIMEOUT', 60 * 60)
+
+
+def user_version_key(user_id):
+    return f'feed:user:{user_id}:version'
+
+
+@dataclass
+class ChildFeed:
+    child_id: int
+    age_group: str
+    events: List[Event] = field(default_factory=list)
+    materials: List[KidsMaterial] = field(default_factory=list)
+
+
+def upcoming_events(child, limit):
+    booked = Booking.objects.filter(event=OuterRef('pk'), child_id=child.pk, status__in=BOOKED_STATUSES)
+    return list(
+        Event.objects.with_capacity().upcoming()
+        .filter(age_group__in=[child.age_group, 'all'], confirmed_count__lt=F('max_participants'))
+        .exclude(Exists(booked))
+        .order_by('date')[:limit]
+    )
+
+
+def unseen_materials(child, user_id, limit):
+    seen = LearningProgress.objects.filter(material=OuterRef('pk'), user_id=user_id)
+    return list(
+        KidsMaterial.objects.select_related('category')
+        .filter(age_group=child.age_group)
+        .exclude(Exists(seen))
+        .order_by('-popularity', '-created_at', '-id')[:limit]
+    )
+
+
+def timeout_for(child, today):
+    """Saniyə: növbəti yaş qrupuna keçidə qədər, ən çox CHILD_FEED_CACHE_TIMEOUT"""
+    change = child.next_age_group_change(today)
+    if change is None:
+        return cache_timeout()
+    starts = timezone.make_aware(datetime.combine(change, day_time.min))
+    return max(1, min(cache_timeout(), int((starts - timezone.now()).total_seconds())))
+
+
+def child_feed(child, user_id, events_limit=6, materials_limit=8):
+    """child - Child.objects.with_age_group() ilə yüklənmiş obyekt; cache-də yoxdursa 2 sorğu"""
+    versions = stamps.get_many([CATALOG_VERSION_KEY, user_version_key(user_id)])
+    catalog_version, user_version = versions[CATALOG_VERSION_KEY], versions[user_version_key(user_id)]
+    key = f'feed:child:{child.pk}:{child.age_group}:{catalog_version}:{user_version}'
+
+    feed = cache.get(key)
+    if feed is None:
+        feed = ChildFeed(
+            child_id=child.pk,
+            age_group=child.age_group,
+            events=upcoming_events(child, events_limit),
+            materials=unseen_materials(child, user_id, materials_limit),
+        )
+        cache.set(key, feed, timeout_for(child, timezone.localdate()))
+    return feed
+
+
+def bump_catalog():
+    stamps.bump(CATALOG_VERSION_KEY)
+
+
+def bump_user(user_id):
+    stamps.bump(user_version_key(user_id))
+
+
+def _catalog_changed(sender, **kwargs):
+    transaction.on_commit(bump_catalog)
+
+
+def _user_changed(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_user(user_id))
+
+
+for _signal in (post_save, post_delete):
+    _signal.connect(_catalog_changed, sender=Event, dispatch_uid='feed:event')
+    _signal.connect(_catalog_changed, sender=KidsMaterial, dispatch_uid='feed:material')
+    _signal.connect(_user_changed, sender=LearningProgress, dispatch_uid='feed:progress')
+    _signal.connect(_user_changed, sender=Booking, dispatch_uid='feed:booking')
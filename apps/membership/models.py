@@ -1,6 +1,23 @@
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import Case, Value, When
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
+
+
+# Tədbir və materialların yaş qrupları: (bu yaşa çatmamış, qrup); qalanlar '12+'
+AGE_GROUP_LIMITS = [(3, '0-3'), (6, '3-6'), (9, '6-9'), (12, '9-12')]
+OLDEST_AGE_GROUP = '12+'
+
+
+def shift_years(day, years):
+    """day-dən years il sonra (mənfi - əvvəl); 29 fevral uyğun ildə 28 fevral olur"""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
 
 
 class MemberProfile(models.Model):
@@ -21,6 +38,21 @@ class MemberProfile(models.Model):
         return f"{self.user.get_full_name() or self.user.username}"
 
 
+class ChildQuerySet(models.QuerySet):
+    def with_age_group(self, today=None):
+        """age_group annotasiyası: doğum tarixi SQL-də yaş qrupuna çevrilir.
+        
+        Yaş Python-da deyil, sərhəd tarixləri ilə müqayisədə hesablanır:
+        birth_date > bu gündən 3 il əvvəl -> '0-3' və s. (Child.age ilə eyni)
+        """
+        today = today or timezone.localdate()
+        return self.annotate(age_group=Case(
+            *[When(birth_date__gt=shift_years(today, -limit), then=Value(group)) for limit, group in AGE_GROUP_LIMITS],
+            default=Value(OLDEST_AGE_GROUP),
+            output_field=models.CharField(max_length=10),
+        ))
+
+
 class Child(models.Model):
     """Uşaq məlumatları"""
     GENDER_CHOICES = [
@@ -38,6 +70,8 @@ class Child(models.Model):
     photo = models.ImageField(upload_to='children_photos/', blank=True, verbose_name='Şəkil')
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ChildQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Uşaq'
         verbose_name_plural = 'Uşaqlar'
@@ -52,6 +86,17 @@ class Child(models.Model):
         today = date.today()
         return today.year - self.birth_date.year - ((today.month, today.day) < (self.birth_date.month, self.birth_date.day))
     
+    def next_age_group_change(self, today=None):
+        """Uşağın növbəti yaş qrupuna keçdiyi gün; '12+' qrupunda None"""
+        today = today or timezone.localdate()
+        for limit, _ in AGE_GROUP_LIMITS:
+            day = shift_years(self.birth_date, limit)
+            if day.day != self.birth_date.day:
+                day += timedelta(days=1)  # 29 fevral: yaş 1 martda dəyişir (Child.age kimi)
+            if day > today:
+                return day
+        return None
+    
     def get_absolute_url(self):
         return reverse('membership:child_detail', kwargs={'pk': self.pk})
 
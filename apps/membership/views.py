@@ -7,6 +7,7 @@ from django.urls import reverse_lazy
 from django.db import transaction
 from .forms import CustomUserCreationForm, MemberProfileForm, ChildForm, UserUpdateForm
 from .models import MemberProfile, Child, Membership
+from . import feed
 
 class CustomLoginView(LoginView):
     template_name = 'membership/login.html'
@@ -147,8 +148,9 @@ def edit_child(request, pk):
 @login_required
 def child_detail(request, pk):
     """Uşaq detalları"""
-    child = get_object_or_404(Child, pk=pk, parent__user=request.user)
+    child = get_object_or_404(Child.objects.with_age_group(), pk=pk, parent__user=request.user)
     
     return render(request, 'membership/child_detail.html', {
-        'child': child
+        'child': child,
+        'feed': feed.child_feed(child, request.user.pk)
     })
\ No newline at end of file